@@ -1,4 +1,6 @@
 # app.py
+import os
+
 import pandas as pd
 import streamlit as st
 
@@ -12,18 +14,26 @@ st.title("STRAT Scanner")
 st.caption("Educational / informational purposes only. Not financial advice. Trading involves risk.")
 
 
-@st.cache_data(ttl=60)
-def load_results() -> pd.DataFrame:
+def _mtime(path: str) -> float:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.0
+
+
+# mtime is part of the cache key: files are only re-read after a new scan lands
+@st.cache_data(max_entries=2)
+def load_results(path: str, mtime: float) -> pd.DataFrame:
     try:
-        return pd.read_csv(RESULTS_PATH)
+        return pd.read_csv(path)
     except Exception:
         return pd.DataFrame()
 
 
-@st.cache_data(ttl=60)
-def load_context() -> pd.DataFrame:
+@st.cache_data(max_entries=2)
+def load_context(path: str, mtime: float) -> pd.DataFrame:
     try:
-        return pd.read_csv(CONTEXT_PATH)
+        return pd.read_csv(path)
     except Exception:
         return pd.DataFrame()
 
@@ -130,7 +140,7 @@ def _industry_heatmap(ctx: pd.DataFrame, sector: str, mode: str) -> pd.DataFrame
 # -----------------------------
 # Load results (scanner table)
 # -----------------------------
-df = load_results()
+df = load_results(RESULTS_PATH, _mtime(RESULTS_PATH))
 if df.empty:
     st.error("No scan results found yet. The workflow hasn't written cache/results/latest.csv yet.")
     st.stop()
@@ -177,13 +187,13 @@ only_aligned = st.sidebar.checkbox("Only aligned with bias", value=False)
 
 f = df.copy()
 if ticker_search:
-    f = f[f["ticker"].str.upper().str.contains(ticker_search, na=False)]
+    f = f[f["ticker"].str.upper().str.contains(ticker_search, regex=False, na=False)]
 if tf_selected:
     f = f[f["tf"].isin(tf_selected)]
 if dir_selected:
     f = f[f["dir"].isin(dir_selected)]
 if setup_search:
-    f = f[f["setup"].astype(str).str.contains(setup_search, case=False, na=False)]
+    f = f[f["setup"].astype(str).str.contains(setup_search, case=False, regex=False, na=False)]
 if sector_selected:
     f = f[f["sector"].isin(sector_selected)]
 if only_aligned and "aligned" in f.columns:
@@ -243,7 +253,7 @@ This matches “how it’s doing *right now*” and **can change until the candl
         """
     )
 
-    ctx = load_context()
+    ctx = load_context(CONTEXT_PATH, _mtime(CONTEXT_PATH))
     if ctx.empty:
         st.error("No context.csv found yet. Run the workflow once after updating main.py.")
         st.stop()
@@ -18,12 +18,27 @@ CORE_ETFS = [
 ]
 
 # Intraday windows: keep tight (prevents Yahoo 730-day errors)
-DEV_YF_BASE_FEEDS = {"1d": {"period": "max"}, "60m": {"period": "60d"}}
-YF_BASE_FEEDS = {"1d": {"period": "max"}, "60m": {"period": "60d"}}
+# "tail": bars handed to the scan (cache keeps full history). 1600 daily bars ~ 6 years,
+# enough for fully formed closed + prior Y candles.
+DEV_YF_BASE_FEEDS = {"1d": {"period": "max", "tail": 1600}, "60m": {"period": "60d"}}
+YF_BASE_FEEDS = {"1d": {"period": "max", "tail": 1600}, "60m": {"period": "60d"}}
 
 REQUEST_TIMEOUT_SEC = 20
 
+# Scan worker threads. Feeds are downloaded by the single prefetch thread, so this
+# only bounds concurrent classify/resample work (and the rare per-ticker fallback).
+SCAN_MAX_WORKERS = 8
+
+# Scan tickers in worker processes (one per core) instead of threads. Feeds are
+# prefetched up front, so the scan itself is CPU-bound pandas work.
+SCAN_USE_PROCESSES = False
+
+# Downloaded universe chunks allowed to wait for the scan pool (bounds memory)
+PREFETCH_QUEUE_SIZE = 4
+
 UNIVERSE_CACHE_TTL_SEC = 24 * 3600
+# Tickers whose daily history was too short to scan are skipped for this long
+UNSCANNABLE_TTL_SEC = 3 * 24 * 3600
 CACHE_TTL = {"1d": 12 * 3600, "60m": 60 * 60}
 
 SNAPSHOT_PATH = "cache/snapshots/latest.json"
@@ -1,5 +1,8 @@
 import pandas as pd
 
+# strat label of the last bar -> bias (anything else is neutral)
+_LABEL_BIAS = {"2U": "bullish", "2D": "bearish"}
+
 CONTINUITY_SCORE_MEANING = {
     5:  "Strong Bullish Continuity (All timeframes aligned up)",
     4:  "Bullish Continuity (HTFs aligned, minor LTF pullback)",
@@ -14,18 +17,6 @@ CONTINUITY_SCORE_MEANING = {
    -5:  "Strong Bearish Continuity (All timeframes aligned down)"
 }
 
-def strat_bias(strat_value: str) -> str:
-    """
-    Convert STRAT candle to directional bias
-    """
-    if strat_value == "2U":
-        return "bullish"
-    elif strat_value == "2D":
-        return "bearish"
-    else:
-        return "neutral"
-
-
 def timeframe_continuity(timeframes: dict) -> dict:
     """
     timeframes = {
@@ -45,8 +36,8 @@ def timeframe_continuity(timeframes: dict) -> dict:
             result[tf] = "neutral"
             continue
 
-        last_strat = df.iloc[-1]["strat"]
-        bias = strat_bias(last_strat)
+        # .iat yields the label for both categorical and plain string columns
+        bias = _LABEL_BIAS.get(df["strat"].iat[-1], "neutral")
         result[tf] = bias
 
         if bias == "bullish":
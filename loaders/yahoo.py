@@ -1,10 +1,18 @@
 # loaders/yahoo.py
 
+import functools
+import json
 import os
+import sqlite3
+import threading
 import time
-from typing import Optional, List
+from typing import Dict, Optional, List
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import yfinance as yf
 
 from config import CACHE_TTL, REQUEST_TIMEOUT_SEC
@@ -12,99 +20,440 @@ from config import CACHE_TTL, REQUEST_TIMEOUT_SEC
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 CACHE_DIR = os.path.join(PROJECT_ROOT, "cache", "ohlc")
 
+# (ticker, interval) -> intraday period that last returned data
+PERIOD_HINTS_PATH = os.path.join(CACHE_DIR, "_period_hints.json")
+PERIOD_HINT_MAX_MISSES = 3
+# A hint is only trusted this long after it was set; then the full chain (longest
+# period first) is tried again, so one transient 60d failure can't pin a ticker to 30d
+PERIOD_HINT_TTL_SEC = 7 * 24 * 3600
 
-def _ensure_cache_dir() -> None:
-    os.makedirs(CACHE_DIR, exist_ok=True)
+_period_hints: Optional[Dict[str, dict]] = None
+_period_hints_lock = threading.Lock()
 
+# (ticker, interval) -> cache file mtime, so freshness checks don't stat every file
+INDEX_PATH = os.path.join(CACHE_DIR, "_index.sqlite")
 
+_index_conn: Optional[sqlite3.Connection] = None
+_index_pid: Optional[int] = None
+_index_lock = threading.Lock()
+
+# (ticker, interval, tail) -> (cache mtime, frame) filled by load_ohlc_batch, so a
+# load_ohlc for a ticker the batch already handled skips the stat + Parquet read
+_mem: Dict[tuple, tuple] = {}
+_mem_lock = threading.Lock()
+
+# yf.download keeps its results in module-global state (shared._DFS), so concurrent
+# calls from different threads clobber each other: one call at a time per process.
+_download_lock = threading.Lock()
+
+
+def _ensure_cache_dir(path: str = CACHE_DIR) -> None:
+    os.makedirs(path, exist_ok=True)
+
+
+_SAFE_TICKER = str.maketrans({"/": "_", "^": "", "=": "_", " ": "", ".": "-"})
+
+
+@functools.lru_cache(maxsize=4096)
 def _cache_path(ticker: str, interval: str) -> str:
-    safe_ticker = (
-        str(ticker)
-        .replace("/", "_")
-        .replace("^", "")
-        .replace("=", "_")
-        .replace(" ", "")
-        .replace(".", "-")
-    )
+    safe_ticker = str(ticker).translate(_SAFE_TICKER)
     safe_interval = str(interval).replace(" ", "")
-    return os.path.join(CACHE_DIR, f"{safe_ticker}_{safe_interval}.csv")
+    # Shard by the first two characters so no single directory holds the whole universe
+    return os.path.join(CACHE_DIR, safe_ticker[:2] or "_", f"{safe_ticker}_{safe_interval}.parquet")
+
+
+def _index() -> sqlite3.Connection:
+    global _index_conn, _index_pid
+    # sqlite connections must not cross a fork (process-pool scan workers open their own)
+    if _index_conn is None or _index_pid != os.getpid():
+        _ensure_cache_dir()
+        conn = sqlite3.connect(INDEX_PATH, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS ix ("
+            "ticker TEXT, interval TEXT, mtime REAL, PRIMARY KEY (ticker, interval))"
+        )
+        conn.commit()
+        _index_conn = conn
+        _index_pid = os.getpid()
+    return _index_conn
+
+
+def _index_mtime(ticker: str, interval: str) -> Optional[float]:
+    with _index_lock:
+        row = _index().execute(
+            "SELECT mtime FROM ix WHERE ticker=? AND interval=?", (ticker, interval)
+        ).fetchone()
+    return row[0] if row else None
+
+
+def _index_touch(ticker: str, interval: str, mtime: float) -> None:
+    _index_touch_many([(ticker, interval, mtime)])
+
+
+def _index_touch_many(entries: List[tuple]) -> None:
+    """
+    entries: (ticker, interval, mtime) rows, committed in one transaction.
+    """
+    if not entries:
+        return
+    with _index_lock:
+        conn = _index()
+        conn.executemany(
+            "INSERT OR REPLACE INTO ix (ticker, interval, mtime) VALUES (?, ?, ?)",
+            entries,
+        )
+        conn.commit()
+
+
+def _cache_mtime(ticker: str, interval: str) -> Optional[float]:
+    """
+    Cache mtime from the index. Files the index hasn't seen yet (caches written before
+    it existed, legacy CSVs) are picked up from disk on first access.
+    """
+    mtime = _index_mtime(ticker, interval)
+    if mtime is not None:
+        return mtime
+
+    _migrate_legacy_cache(ticker, interval)
+    path = _cache_path(ticker, interval)
+    if not os.path.exists(path):
+        return None
+    mtime = os.path.getmtime(path)
+    _index_touch(ticker, interval, mtime)
+    return mtime
 
 
-def _is_cache_fresh(path: str, max_age_seconds: int) -> bool:
-    if not os.path.exists(path):
+def _is_cache_fresh(ticker: str, interval: str, max_age_seconds: int) -> bool:
+    mtime = _cache_mtime(ticker, interval)
+    if mtime is None:
         return False
-    return (time.time() - os.path.getmtime(path)) <= max_age_seconds
+    return (time.time() - mtime) <= max_age_seconds
+
 
+_CACHE_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
 
-def _read_cache(path: str) -> pd.DataFrame:
+# Small row groups so a tail read of a long daily history only decodes the last few
+_CACHE_ROW_GROUP_ROWS = 1024
+
+
+def _mem_get(ticker: str, interval: str, tail: Optional[int], max_age_seconds: int) -> Optional[pd.DataFrame]:
+    with _mem_lock:
+        hit = _mem.get((ticker, interval, tail))
+    if hit is None or (time.time() - hit[0]) > max_age_seconds:
+        return None
+    return hit[1]
+
+
+def _mem_put(ticker: str, interval: str, tail: Optional[int], mtime: Optional[float], df: pd.DataFrame) -> None:
+    if mtime is None:
+        return
+    with _mem_lock:
+        _mem[(ticker, interval, tail)] = (mtime, df)
+
+
+def clear_memory_cache() -> None:
+    """Drop the in-process frames kept by load_ohlc / load_ohlc_batch (call once per scan run)."""
+    with _mem_lock:
+        _mem.clear()
+
+
+def _tail(df: pd.DataFrame, tail: Optional[int]) -> pd.DataFrame:
+    if not tail or len(df) <= tail:
+        return df
+    return df.iloc[-tail:].reset_index(drop=True)
+
+
+def _read_cache(path: str, tail: Optional[int] = None) -> pd.DataFrame:
     try:
-        df = pd.read_csv(path)
+        if not tail:
+            df = pd.read_parquet(path, engine="pyarrow", columns=_CACHE_COLUMNS)
+        else:
+            with pq.ParquetFile(path) as pf:
+                meta = pf.metadata
+                groups: List[int] = []
+                rows = 0
+                for g in range(meta.num_row_groups - 1, -1, -1):
+                    groups.append(g)
+                    rows += meta.row_group(g).num_rows
+                    if rows >= tail:
+                        break
+                df = pf.read_row_groups(sorted(groups), columns=_CACHE_COLUMNS).to_pandas()
+            df = _tail(df, tail)
         if df is None or df.empty:
             return pd.DataFrame()
-        df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
-        df = df.dropna(subset=["timestamp"])
         return df
     except Exception:
         return pd.DataFrame()
 
 
+def _write_cache(
+    ticker: str,
+    interval: str,
+    data: pd.DataFrame,
+    mtime: Optional[float] = None,
+    touch_index: bool = True,
+) -> Optional[float]:
+    """
+    Returns the written file's mtime (None on failure). With touch_index=False the
+    caller records it in the index itself (batched writes).
+    """
+    path = _cache_path(ticker, interval)
+    try:
+        _ensure_cache_dir(os.path.dirname(path))
+        data.to_parquet(
+            path,
+            engine="pyarrow",
+            compression="snappy",
+            index=False,
+            row_group_size=_CACHE_ROW_GROUP_ROWS,
+        )
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+        else:
+            mtime = os.path.getmtime(path)
+    except Exception:
+        return None
+
+    if touch_index:
+        _index_touch(ticker, interval, mtime)
+    return mtime
+
+
+def _legacy_csv_options(tz: Optional[str]) -> pacsv.ConvertOptions:
+    column_types = {c: pa.float64() for c in _CACHE_COLUMNS[1:]}
+    column_types["timestamp"] = pa.timestamp("ns", tz=tz)
+    return pacsv.ConvertOptions(column_types=column_types, include_columns=_CACHE_COLUMNS)
+
+
+def _read_legacy_csv(path: str) -> pd.DataFrame:
+    """
+    Old CSV caches: daily rows carry naive dates, intraday rows carry a UTC offset
+    (which Arrow only parses into a tz-aware column), so try naive first.
+    Intraday bars stay in UTC, like fresh yf.download output, so derived 2H/3H/4H
+    bins don't depend on where the bars came from.
+    """
+    try:
+        try:
+            table = pacsv.read_csv(path, convert_options=_legacy_csv_options(None))
+        except pa.ArrowInvalid:
+            table = pacsv.read_csv(path, convert_options=_legacy_csv_options("UTC"))
+
+        df = table.to_pandas(split_blocks=True, self_destruct=True)
+        if df is None or df.empty:
+            return pd.DataFrame()
+        return df.dropna(subset=["timestamp"])
+    except Exception:
+        return pd.DataFrame()
+
+
+def _migrate_legacy_cache(ticker: str, interval: str) -> None:
+    """
+    One-time rewrite of an old CSV cache (flat or sharded layout) as Parquet.
+    The CSV's mtime is carried over so freshness checks are unaffected.
+    """
+    path = _cache_path(ticker, interval)
+    if os.path.exists(path):
+        return
+
+    name = os.path.splitext(os.path.basename(path))[0] + ".csv"
+    for legacy in (os.path.join(os.path.dirname(path), name), os.path.join(CACHE_DIR, name)):
+        if not os.path.exists(legacy):
+            continue
+
+        df = _read_legacy_csv(legacy)
+        if not df.empty and _write_cache(ticker, interval, df, mtime=os.path.getmtime(legacy)) is None:
+            return
+
+        try:
+            os.remove(legacy)
+        except OSError:
+            pass
+        return
+
+
 _INTRADAY_INTERVALS = {"1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h"}
+_SAFE_INTRADAY_PERIODS = ("7d", "30d", "60d", "90d")
+
+# Symbols per yf.download call. yfinance still sends one chart request per symbol;
+# threads=True lets it run a batch's requests concurrently on its own threads.
+BATCH_SIZE = 20
+
+# Stale daily (and longer) caches are topped up from this many days before their
+# last bar instead of re-downloading the whole history; the overlap is compared
+# against the cache to catch upstream re-adjustments (splits).
+INCREMENTAL_OVERLAP_DAYS = 10
+
+
+_YF_FIELDS = {
+    "open": "Open",
+    "high": "High",
+    "low": "Low",
+    "close": "Close",
+    "volume": "Volume",
+}
+_PRICE_COLS = ("open", "high", "low", "close")
+
+
+def _numeric_values(col: pd.Series) -> np.ndarray:
+    # Yahoo already hands back numeric columns; only coerce when it didn't.
+    if col.dtype.kind in "biuf":
+        return col.to_numpy()
+    return pd.to_numeric(col, errors="coerce").to_numpy()
 
 
 def _normalize_download(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Single pass over the raw yfinance arrays:
+      drop rows with a bad timestamp or missing OHLC, sort by timestamp,
+      keep the first row per timestamp, then build the frame once.
+    """
     if df is None or len(df) == 0:
         return pd.DataFrame()
 
     if isinstance(df.columns, pd.MultiIndex):
         df.columns = [c[0] for c in df.columns]
 
-    df = df.rename(
-        columns={
-            "Open": "open",
-            "High": "high",
-            "Low": "low",
-            "Close": "close",
-            "Adj Close": "adj_close",
-            "Volume": "volume",
-        }
-    ).reset_index()
-
-    if "Date" in df.columns:
-        ts_col = "Date"
-    elif "Datetime" in df.columns:
-        ts_col = "Datetime"
-    else:
-        ts_col = df.columns[0]
+    if any(_YF_FIELDS[c] not in df.columns for c in _PRICE_COLS):
+        return pd.DataFrame()
 
-    df = df.rename(columns={ts_col: "timestamp"})
+    ts = pd.DatetimeIndex(pd.to_datetime(df.index, errors="coerce"))
+
+    values = {}
+    for c, src in _YF_FIELDS.items():
+        if src not in df.columns:
+            continue
+        arr = _numeric_values(df[src])
+        values[c] = arr.astype("float64", copy=False) if c in _PRICE_COLS else arr
+
+    keep = ~ts.isna()
+    for c in _PRICE_COLS:
+        keep &= ~np.isnan(values[c])
+    pos = np.flatnonzero(keep)
+
+    ts_i8 = ts.asi8[pos]
+    order = np.argsort(ts_i8, kind="stable")
+    _, first = np.unique(ts_i8[order], return_index=True)
+    take = pos[order[first]]
+
+    out = {"timestamp": ts[take]}
+    for c, arr in values.items():
+        out[c] = arr[take]
+    return pd.DataFrame(out)
+
+
+def _download_once(ticker: str, interval: str, period: str, start: Optional[str] = None) -> pd.DataFrame:
+    span = {"start": start} if start is not None else {"period": period}
+    with _download_lock:
+        raw = yf.download(
+            tickers=ticker,
+            interval=interval,
+            **span,
+            auto_adjust=False,
+            prepost=False,
+            progress=False,
+            threads=False,
+            timeout=REQUEST_TIMEOUT_SEC,
+        )
+    return _normalize_download(raw)
 
-    keep = ["timestamp", "open", "high", "low", "close", "volume"]
-    df = df[[c for c in keep if c in df.columns]].copy()
 
-    df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
-    df = df.dropna(subset=["timestamp"])
+def _incremental_start(cached: Optional[pd.DataFrame]) -> Optional[str]:
+    if cached is None or cached.empty:
+        return None
+    last = pd.Timestamp(cached["timestamp"].iat[-1])
+    return (last - pd.Timedelta(days=INCREMENTAL_OVERLAP_DAYS)).strftime("%Y-%m-%d")
 
-    for c in ["open", "high", "low", "close", "volume"]:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce")
 
-    df = df.dropna(subset=["open", "high", "low", "close"])
-    df = df.sort_values("timestamp").drop_duplicates(subset=["timestamp"]).reset_index(drop=True)
-    return df
+def _merge_incremental(cached: pd.DataFrame, fresh: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    """
+    Cached history topped up with the freshly downloaded tail (fresh wins per timestamp).
+    None when fresh is empty or the overlapping closed bars disagree (history was
+    re-adjusted upstream), in which case the caller downloads the full history.
+    """
+    if fresh is None or fresh.empty or cached.empty:
+        return None
 
+    # The cache's last bar may have been the live one, so it isn't compared
+    closed = cached.iloc[:-1]
+    shared = closed[["timestamp", "close"]].merge(fresh[["timestamp", "close"]], on="timestamp")
+    if shared.empty or not np.allclose(shared["close_x"], shared["close_y"], rtol=1e-3):
+        return None
+
+    merged = pd.concat([cached, fresh], ignore_index=True)
+    merged = merged.drop_duplicates(subset="timestamp", keep="last")
+    return merged.sort_values("timestamp", kind="stable").reset_index(drop=True)
+
+
+def _download_incremental(ticker: str, interval: str, path: str) -> Optional[pd.DataFrame]:
+    if interval in _INTRADAY_INTERVALS or not os.path.exists(path):
+        return None
+    cached = _read_cache(path)
+    start = _incremental_start(cached)
+    if start is None:
+        return None
+    return _merge_incremental(cached, _download_once(ticker, interval, period="max", start=start))
+
+
+def _load_period_hints() -> Dict[str, dict]:
+    global _period_hints
+    if _period_hints is None:
+        try:
+            with open(PERIOD_HINTS_PATH, "r", encoding="utf-8") as f:
+                _period_hints = json.load(f)
+        except Exception:
+            _period_hints = {}
+    return _period_hints
+
+
+def _save_period_hints(hints: Dict[str, dict]) -> None:
+    try:
+        _ensure_cache_dir()
+        with open(PERIOD_HINTS_PATH, "w", encoding="utf-8") as f:
+            json.dump(hints, f, indent=2, sort_keys=True)
+    except Exception:
+        pass
+
+
+def _period_hint(ticker: str, interval: str) -> Optional[str]:
+    with _period_hints_lock:
+        hint = _load_period_hints().get(f"{ticker}|{interval}")
+    return hint.get("period") if _hint_is_fresh(hint) else None
+
+
+def _hint_is_fresh(hint: Optional[dict]) -> bool:
+    return bool(hint) and time.time() - float(hint.get("set_at", 0)) <= PERIOD_HINT_TTL_SEC
 
-def _download_once(ticker: str, interval: str, period: str) -> pd.DataFrame:
-    raw = yf.download(
-        tickers=ticker,
-        interval=interval,
-        period=period,
-        auto_adjust=False,
-        prepost=False,
-        progress=False,
-        threads=False,
-        timeout=REQUEST_TIMEOUT_SEC,
-    )
-    return _normalize_download(raw)
+
+def _update_period_hint(ticker: str, interval: str, period: Optional[str]) -> None:
+    """
+    period = the one that returned data, or None if the whole chain came back empty.
+    A hint is dropped after PERIOD_HINT_MAX_MISSES empty chains in a row. set_at is only
+    renewed when the chain ran without the hint (new or expired hint), i.e. when every
+    longer period was actually tried and failed; a hint that keeps succeeding still expires.
+    """
+    key = f"{ticker}|{interval}"
+    with _period_hints_lock:
+        hints = _load_period_hints()
+        hint = hints.get(key)
+
+        if period is not None:
+            same = _hint_is_fresh(hint) and hint.get("period") == period
+            if same and not hint.get("misses"):
+                return
+            set_at = hint["set_at"] if same else time.time()
+            hints[key] = {"period": period, "misses": 0, "set_at": set_at}
+        else:
+            if hint is None:
+                return
+            misses = int(hint.get("misses", 0)) + 1
+            if misses >= PERIOD_HINT_MAX_MISSES:
+                del hints[key]
+            else:
+                hints[key] = {**hint, "misses": misses}
+
+        _save_period_hints(hints)
 
 
 def _download_with_fallback(ticker: str, interval: str, period: str) -> pd.DataFrame:
@@ -119,7 +468,7 @@ def _download_with_fallback(ticker: str, interval: str, period: str) -> pd.DataF
 
     # Respect caller if already safe; otherwise override to 60d
     safe_period = (period or "").strip().lower()
-    if safe_period in ("7d", "30d", "60d", "90d"):
+    if safe_period in _SAFE_INTRADAY_PERIODS:
         fallback_periods.append(period)
     else:
         fallback_periods.append("60d")
@@ -128,11 +477,19 @@ def _download_with_fallback(ticker: str, interval: str, period: str) -> pd.DataF
         if p not in fallback_periods:
             fallback_periods.append(p)
 
+    # Try whatever worked last time first (e.g. 7d for a fresh IPO)
+    hint = _period_hint(ticker, interval_norm)
+    if hint in fallback_periods:
+        fallback_periods.remove(hint)
+        fallback_periods.insert(0, hint)
+
     for p in fallback_periods:
         df = _download_once(ticker, interval_norm, p)
         if df is not None and not df.empty:
+            _update_period_hint(ticker, interval_norm, p)
             return df
 
+    _update_period_hint(ticker, interval_norm, None)
     return pd.DataFrame()
 
 
@@ -141,36 +498,167 @@ def load_ohlc(
     interval: str = "1d",
     period: str = "max",
     max_age_seconds: Optional[int] = None,
-) -> pd.DataFrame:
+    tail: Optional[int] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    tail: only return the last `tail` bars (the cache always keeps full history).
+    Returns None when neither Yahoo nor the cache has any bars.
+    """
     _ensure_cache_dir()
 
     interval = interval.strip()
     if max_age_seconds is None:
         max_age_seconds = int(CACHE_TTL.get(interval, 2 * 3600))
 
+    # 0) already loaded this run (load_ohlc_batch or an earlier load_ohlc)
+    hit = _mem_get(ticker, interval, tail, max_age_seconds)
+    if hit is not None:
+        return hit
+
     path = _cache_path(ticker, interval)
 
     # 1) fresh cache
-    if _is_cache_fresh(path, max_age_seconds):
-        cached = _read_cache(path)
+    if _is_cache_fresh(ticker, interval, max_age_seconds):
+        cached = _read_cache(path, tail)
         if not cached.empty:
+            _mem_put(ticker, interval, tail, _cache_mtime(ticker, interval), cached)
             return cached
 
-    # 2) Yahoo fetch
-    data = _download_with_fallback(ticker=ticker, interval=interval, period=period)
+    # 2) Yahoo fetch: top up a daily+ cache, else the full history
+    data = _download_incremental(ticker, interval, path)
+    if data is None:
+        data = _download_with_fallback(ticker=ticker, interval=interval, period=period)
 
     if data is None or data.empty:
         # 3) fallback to stale cache
         if os.path.exists(path):
-            cached = _read_cache(path)
+            cached = _read_cache(path, tail)
             if not cached.empty:
                 return cached
-        return pd.DataFrame()
+        return None
 
     # 4) write cache
-    try:
-        data.to_csv(path, index=False)
-    except Exception:
-        pass
-
+    mtime = _write_cache(ticker, interval, data)
+    data = _tail(data, tail)
+    _mem_put(ticker, interval, tail, mtime, data)
     return data
+
+
+def _split_batch_download(raw: pd.DataFrame, batch: List[str]) -> Dict[str, pd.DataFrame]:
+    """
+    raw comes from yf.download(..., group_by="ticker"): columns are (ticker, field).
+    Returns normalized per-ticker frames; tickers Yahoo had nothing for are left out.
+    """
+    if raw is None or len(raw) == 0:
+        return {}
+
+    out: Dict[str, pd.DataFrame] = {}
+    if not isinstance(raw.columns, pd.MultiIndex):
+        if len(batch) == 1:
+            df = _normalize_download(raw)
+            if not df.empty:
+                out[batch[0]] = df
+        return out
+
+    for level in range(raw.columns.nlevels):
+        symbols = set(raw.columns.get_level_values(level))
+        if not any(t in symbols for t in batch):
+            continue
+        for t in batch:
+            if t not in symbols:
+                continue
+            df = _normalize_download(raw.xs(t, axis=1, level=level))
+            if not df.empty:
+                out[t] = df
+        break
+
+    return out
+
+
+def load_ohlc_batch(
+    tickers: List[str],
+    interval: str = "1d",
+    period: str = "max",
+    max_age_seconds: Optional[int] = None,
+    tail: Optional[int] = None,
+) -> Dict[str, Optional[pd.DataFrame]]:
+    """
+    load_ohlc for a whole universe: fresh caches are read from disk, the rest are
+    downloaded BATCH_SIZE symbols per yf.download call (one chart request per symbol,
+    run concurrently by yfinance). Tickers missing from a batch go through load_ohlc
+    (intraday fallback chain + stale cache).
+    """
+    _ensure_cache_dir()
+
+    interval = interval.strip()
+    if max_age_seconds is None:
+        max_age_seconds = int(CACHE_TTL.get(interval, 2 * 3600))
+
+    batch_period = period
+    if interval in _INTRADAY_INTERVALS and (period or "").strip().lower() not in _SAFE_INTRADAY_PERIODS:
+        batch_period = "60d"
+
+    out: Dict[str, Optional[pd.DataFrame]] = {}
+    stale: List[str] = []
+    for t in tickers:
+        if _is_cache_fresh(t, interval, max_age_seconds):
+            cached = _read_cache(_cache_path(t, interval), tail)
+            if not cached.empty:
+                out[t] = cached
+                _mem_put(t, interval, tail, _cache_mtime(t, interval), cached)
+                continue
+        stale.append(t)
+
+    # Stale daily+ caches are topped up in their own batches (see INCREMENTAL_OVERLAP_DAYS)
+    caches: Dict[str, pd.DataFrame] = {}
+    if interval not in _INTRADAY_INTERVALS:
+        for t in stale:
+            if os.path.exists(_cache_path(t, interval)):
+                cached = _read_cache(_cache_path(t, interval))
+                if not cached.empty:
+                    caches[t] = cached
+    full = [t for t in stale if t not in caches]
+    incremental = [t for t in stale if t in caches]
+
+    batches = [(full[i : i + BATCH_SIZE], False) for i in range(0, len(full), BATCH_SIZE)]
+    batches += [(incremental[i : i + BATCH_SIZE], True) for i in range(0, len(incremental), BATCH_SIZE)]
+
+    for batch, top_up in batches:
+        if top_up:
+            span = {"start": min(_incremental_start(caches[t]) for t in batch)}
+        else:
+            span = {"period": batch_period}
+        try:
+            with _download_lock:
+                raw = yf.download(
+                    tickers=" ".join(batch),
+                    interval=interval,
+                    **span,
+                    group_by="ticker",
+                    auto_adjust=False,
+                    prepost=False,
+                    progress=False,
+                    threads=True,
+                    timeout=REQUEST_TIMEOUT_SEC,
+                )
+        except Exception:
+            raw = None
+
+        fetched = _split_batch_download(raw, batch)
+        written: List[tuple] = []
+        for t in batch:
+            data = fetched.get(t)
+            if top_up:
+                data = _merge_incremental(caches.pop(t), data)
+            if data is None:
+                out[t] = load_ohlc(t, interval=interval, period=period, max_age_seconds=max_age_seconds, tail=tail)
+                continue
+            mtime = _write_cache(t, interval, data, touch_index=False)
+            if mtime is not None:
+                written.append((t, interval, mtime))
+            out[t] = _tail(data, tail)
+            _mem_put(t, interval, tail, mtime, out[t])
+        # one index commit per batch instead of one per file
+        _index_touch_many(written)
+
+    return out
@@ -2,6 +2,12 @@
 
 import sys
 import os
+import functools
+import queue
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, fields
+import numpy as np
 import pandas as pd
 from zoneinfo import ZoneInfo
 
@@ -16,14 +22,18 @@ from config import (
     DEV_YF_BASE_FEEDS,
     YF_BASE_FEEDS,
     SECTOR_TOP_ETFS,
+    SCAN_MAX_WORKERS,
+    SCAN_USE_PROCESSES,
+    PREFETCH_QUEUE_SIZE,
 )
 from snapshot import write_snapshot
 
-from universe.loader import load_universe
-from loaders.yahoo import load_ohlc
-from timeframes.resample import resample_timeframe
-from strat.classify import classify_strat_candles
-from strat_signals import analyze_last_closed_setups, last_closed_index
+from universe.loader import SYMBOL_TRANSLATION, load_universe, load_unscannable, record_unscannable
+from loaders.yahoo import BATCH_SIZE, clear_memory_cache, load_ohlc, load_ohlc_batch
+from timeframes.resample import resample_timeframes
+from strat.classify import STRAT_TYPES, classify_strat_codes
+from scoring.continuity import SIGN, WEIGHTS
+from strat_signals import NY, analyze_last_closed_setups, last_closed_index
 
 TARGET_TFS = ["Y", "Q", "M", "W", "D", "4H", "3H", "2H", "1H"]
 
@@ -39,7 +49,20 @@ DERIVED = {
     "Y": ("1d", "Y"),
 }
 
-WEIGHTS = {"Y": 5, "Q": 4, "M": 3, "W": 2, "D": 1}
+BASE_FEEDS = DEV_YF_BASE_FEEDS if DEV_MODE else YF_BASE_FEEDS
+# Daily first: it gates whether the other feeds are worth loading
+BASE_FEED_ORDER = tuple(sorted(BASE_FEEDS, key=lambda iv: iv != "1d"))
+
+BIAS_TFS = tuple(WEIGHTS)
+BIAS_W = np.array([WEIGHTS[tf] for tf in BIAS_TFS], dtype=np.int8)
+
+# strat code -> label; code -1 (unclassified) lands on the trailing None
+STRAT_LABELS = np.array([*STRAT_TYPES, None], dtype=object)
+# strat code -> bias direction (+1 = 2U, -1 = 2D); code -1 also lands on the trailing 0
+STRAT_SIGN = np.array([SIGN.get(s, 0) for s in STRAT_TYPES] + [0], dtype=np.int8)
+
+# Tickers with fewer daily bars are not scanned
+MIN_DAILY_BARS = 50
 
 SECTOR_MAP_PATH = os.path.join("cache", "universe", "sector_map.csv")
 ETF_HOLDINGS_PATH = os.path.join("cache", "universe", "core_etf_holdings.csv")
@@ -48,28 +71,117 @@ STOCKS_BIGGEST_PATH = os.path.join("cache", "universe", "stocks_biggest.csv")
 CONTEXT_OUT_PATH = os.path.join("cache", "results", "context.csv")
 
 
+@dataclass(slots=True)
+class ScanRow:
+    """One setup row of the snapshot (latest.csv / latest.json), in column order."""
+    scan_time: str
+    ticker: str
+    chart_url: str
+    current_price: float | None
+
+    tf: str
+    pattern: str
+    setup: str
+    dir: str | None
+
+    entry: float | None
+    stop: float | None
+
+    score: int
+    aligned: bool | None
+
+    last_strat: str
+    last_candle_type: str
+
+    actionable: str
+    note: str
+
+    ctx_Y: str | None
+    ctx_Q: str | None
+    ctx_M: str | None
+    ctx_W: str | None
+    ctx_D: str | None
+
+
+@dataclass(slots=True)
+class ContextRow:
+    """One ticker row of the heatmap context (strat_context.csv), in column order."""
+    scan_time: str
+    ticker: str
+    current_price: float | None
+
+    ctx_Y_closed: str | None
+    ctx_Q_closed: str | None
+    ctx_M_closed: str | None
+    ctx_W_closed: str | None
+    ctx_D_closed: str | None
+
+    ctx_Y_live: str | None
+    ctx_Q_live: str | None
+    ctx_M_live: str | None
+    ctx_W_live: str | None
+    ctx_D_live: str | None
+
+    score: int
+
+
+# Numeric columns (None -> NaN); everything else is an object column.
+# Rounded to cents once per column; only current_price reaches the records raw
+# (entry/stop are already rounded by analyze_last_closed_setups).
+_FLOAT_COLUMNS = ("current_price", "entry", "stop")
+_INT_COLUMNS = ("score",)
+
+
+def _rows_frame(rows: list, row_type: type) -> pd.DataFrame:
+    """
+    One DataFrame for the whole universe, filled column by column into arrays of
+    known size and dtype (no per-row dicts, no dtype inference pass).
+    """
+    n = len(rows)
+    cols: dict[str, np.ndarray] = {}
+    for c in (f.name for f in fields(row_type)):
+        if c in _FLOAT_COLUMNS:
+            arr = np.fromiter(
+                (np.nan if (v := getattr(r, c)) is None else v for r in rows), dtype=np.float64, count=n
+            )
+            # only matters for current_price (entry/stop arrive rounded); one pass per column
+            cols[c] = np.round(arr, 2, out=arr)
+        elif c in _INT_COLUMNS:
+            cols[c] = np.fromiter((getattr(r, c) for r in rows), dtype=np.int64, count=n)
+        else:
+            arr = np.empty(n, dtype=object)
+            for i, r in enumerate(rows):
+                arr[i] = getattr(r, c)
+            cols[c] = arr
+    return pd.DataFrame(cols, copy=False)
+
+
 def _norm_ticker(x: str) -> str:
-    s = str(x).strip().upper()
-    if s.startswith("$"):
-        s = s[1:]
-    s = s.replace(".", "-")
-    out = []
-    for ch in s:
-        if ("A" <= ch <= "Z") or ("0" <= ch <= "9") or ch == "-":
-            out.append(ch)
-    return "".join(out)
+    return str(x).upper().translate(SYMBOL_TRANSLATION)
+
+
+def _norm_ticker_series(s: pd.Series) -> pd.Series:
+    # _norm_ticker for a whole column
+    return s.astype(str).str.upper().str.translate(SYMBOL_TRANSLATION)
+
+
+# Sector ETF (XLK, ...) -> its sector
+SECTOR_ETF_LOOKUP: dict[str, str] = {
+    _norm_ticker(e): sec for sec, etfs in SECTOR_TOP_ETFS.items() for e in etfs
+}
 
 
 def _infer_resolution_seconds(df: pd.DataFrame) -> int:
-    if df is None or df.empty or "timestamp" not in df.columns or len(df) < 3:
-        return 0
-    ts = pd.to_datetime(df["timestamp"], errors="coerce").dropna().sort_values()
-    if len(ts) < 3:
+    """
+    Median bar spacing of a loader feed. build_timeframe_frames only passes feeds
+    it has checked are parsed + sorted, so this works straight off the int64 buffer.
+    """
+    if df is None or "timestamp" not in df.columns:
         return 0
-    diffs = ts.diff().dropna().dt.total_seconds()
-    if diffs.empty:
+    ns = df["timestamp"].to_numpy(dtype="datetime64[ns]", copy=False).view("i8")
+    if ns.size < 3:
         return 0
-    return int(diffs.median())
+    return int(np.median(np.diff(ns)) // 1_000_000_000)
 
 
 def _is_ok_base_for_60m(df_60: pd.DataFrame) -> bool:
@@ -82,195 +194,265 @@ def _is_ok_base_for_1d(df_d: pd.DataFrame) -> bool:
     return res != 0 and res >= 3600 * 12
 
 
-def build_timeframe_frames(ticker: str):
-    feeds_cfg = DEV_YF_BASE_FEEDS if DEV_MODE else YF_BASE_FEEDS
-
-    feeds: dict[str, pd.DataFrame] = {}
-    for interval, cfg in feeds_cfg.items():
-        df = load_ohlc(ticker, interval=interval, period=cfg["period"])
-        feeds[interval] = (
-            df.sort_values("timestamp").reset_index(drop=True)
-            if df is not None and not df.empty
-            else pd.DataFrame()
-        )
+def prefetch_base_feeds(tickers: list[str]) -> dict[str, dict[str, pd.DataFrame | None]]:
+    """
+    interval -> ticker -> OHLC for a chunk of the universe, via load_ohlc_batch.
+    The daily feed goes first: tickers with fewer than MIN_DAILY_BARS daily bars are
+    not scanned, so the other feeds are only fetched for the rest (others map to None).
+    """
+    feeds: dict[str, dict[str, pd.DataFrame | None]] = {}
+    eligible = list(tickers)
+    for interval in BASE_FEED_ORDER:
+        cfg = BASE_FEEDS[interval]
+        feeds[interval] = load_ohlc_batch(eligible, interval=interval, period=cfg["period"], tail=cfg.get("tail"))
+        if interval == "1d":
+            daily = feeds[interval]
+            eligible = [t for t in eligible if daily.get(t) is not None and len(daily[t]) >= MIN_DAILY_BARS]
+    return feeds
+
+
+def build_timeframe_frames(
+    ticker: str,
+    feeds_in: dict[str, pd.DataFrame | None] | None = None,
+    min_daily_bars: int = 0,
+):
+    """
+    feeds_in: interval -> this ticker's prefetched OHLC (None = Yahoo had nothing).
+    Intervals missing from it are loaded here.
+    min_daily_bars: the daily feed is loaded first; with fewer bars than this nothing
+    else is loaded or derived and no frames are returned.
+    """
+    # Missing feeds are None (never empty frames), so every guard below is an `is None` check
+    feeds: dict[str, pd.DataFrame | None] = {}
+    for interval in BASE_FEED_ORDER:
+        cfg = BASE_FEEDS[interval]
+        if feeds_in is not None and interval in feeds_in:
+            df = feeds_in[interval]
+        else:
+            df = load_ohlc(ticker, interval=interval, period=cfg["period"], tail=cfg.get("tail"))
+        # load_ohlc / load_ohlc_batch hand back frames sorted by timestamp; only
+        # reorder the odd frame that is not
+        if df is not None and not df["timestamp"].is_monotonic_increasing:
+            df = df.sort_values("timestamp", kind="stable").reset_index(drop=True)
+        feeds[interval] = df
+
+        if interval == "1d" and min_daily_bars and (df is None or len(df) < min_daily_bars):
+            return {}, feeds
 
     frames: dict[str, pd.DataFrame] = {}
 
     for tf, (base_interval, _) in DIRECT.items():
-        base = feeds.get(base_interval, pd.DataFrame())
-        if base is not None and not base.empty:
+        base = feeds.get(base_interval)
+        if base is not None:
             frames[tf] = base
 
-    base_60 = feeds.get("60m", pd.DataFrame())
-    base_1d = feeds.get("1d", pd.DataFrame())
+    base_60 = feeds.get("60m")
+    base_1d = feeds.get("1d")
 
-    ok_60 = base_60 is not None and not base_60.empty and _is_ok_base_for_60m(base_60)
-    ok_1d = base_1d is not None and not base_1d.empty and _is_ok_base_for_1d(base_1d)
+    ok_60 = base_60 is not None and _is_ok_base_for_60m(base_60)
+    ok_1d = base_1d is not None and _is_ok_base_for_1d(base_1d)
 
-    for tf, (base_interval, derived_tf) in DERIVED.items():
-        if base_interval == "60m":
-            if not ok_60:
-                continue
-            frames[tf] = resample_timeframe(base_60, derived_tf)
-        elif base_interval == "1d":
-            if not ok_1d:
-                continue
-            frames[tf] = resample_timeframe(base_1d, derived_tf)
+    # All derivations of one base share a single indexing pass
+    for base_interval, base, ok in (("60m", base_60, ok_60), ("1d", base_1d, ok_1d)):
+        if not ok:
+            continue
+        derived = {tf: derived_tf for tf, (b, derived_tf) in DERIVED.items() if b == base_interval}
+        resampled = resample_timeframes(base, list(derived.values()))
+        for tf, derived_tf in derived.items():
+            frames[tf] = resampled[derived_tf]
 
     return frames, feeds
 
 
 def get_current_price(feeds: dict) -> float | None:
-    df_60 = feeds.get("60m")
-    if df_60 is not None and not df_60.empty and "close" in df_60.columns:
-        try:
-            return float(df_60.iloc[-1]["close"])
-        except Exception:
-            pass
-
-    df_d = feeds.get("1d")
-    if df_d is not None and not df_d.empty and "close" in df_d.columns:
-        try:
-            return float(df_d.iloc[-1]["close"])
-        except Exception:
-            pass
+    # Latest close: 60m feed first, then daily
+    for interval in ("60m", "1d"):
+        df = feeds.get(interval)
+        if df is None or "close" not in df.columns:
+            continue
+        closes = df["close"].to_numpy(copy=False)
+        if closes.size:
+            return float(closes[-1])
 
     return None
 
 
-def compute_bias_score(context_closed: dict) -> int:
+def compute_bias_score(closed_codes: np.ndarray) -> int:
     """
     Confirmed bias only: uses CLOSED bars (Y/Q/M/W/D).
+    closed_codes: strat code of the last closed bar per BIAS_TFS entry (-1 = none).
+    """
+    return int(STRAT_SIGN[closed_codes] @ BIAS_W)
+
+
+# Candle shape labels, indexed by the codes candlestick_codes() returns
+CANDLE_NAMES = np.array(
+    [
+        "Dragonfly Doji (bullish-leaning)",
+        "Gravestone Doji (bearish-leaning)",
+        "Doji",
+        "Bullish Hammer-like",
+        "Bearish Hanging-Man-like",
+        "Bullish Inverted Hammer-like",
+        "Bearish Shooting-Star-like",
+        "Bullish Marubozu-like",
+        "Bearish Marubozu-like",
+        "Bullish Candle",
+        "Bearish Candle",
+        "Neutral Candle",
+    ],
+    dtype=object,
+)
+
+
+def candlestick_codes(o: np.ndarray, h: np.ndarray, l: np.ndarray, c: np.ndarray) -> np.ndarray:
     """
-    score = 0
-    for tf, strat in context_closed.items():
-        w = WEIGHTS.get(tf, 0)
-        if strat == "2U":
-            score += w
-        elif strat == "2D":
-            score -= w
-    return score
-
-
-def candlestick_name(o: float, h: float, l: float, c: float) -> str:
-    try:
-        o = float(o); h = float(h); l = float(l); c = float(c)
-    except Exception:
-        return "Unknown"
-
-    rng = max(h - l, 1e-9)
-    body = abs(c - o)
-    upper = h - max(o, c)
-    lower = min(o, c) - l
+    Candle shape code (int8 index into CANDLE_NAMES) for each bar of the given OHLC
+    arrays, in one pass with no per-bar Python.
+    """
+    o = np.asarray(o, dtype=np.float64)
+    h = np.asarray(h, dtype=np.float64)
+    l = np.asarray(l, dtype=np.float64)
+    c = np.asarray(c, dtype=np.float64)
+
+    rng = np.maximum(h - l, 1e-9)
+    body = np.abs(c - o)
+    upper = h - np.maximum(o, c)
+    lower = np.minimum(o, c) - l
 
     bull = c > o
     bear = c < o
 
-    if body <= 0.10 * rng:
-        if lower >= 0.60 * rng and upper <= 0.15 * rng:
-            return "Dragonfly Doji (bullish-leaning)"
-        if upper >= 0.60 * rng and lower <= 0.15 * rng:
-            return "Gravestone Doji (bearish-leaning)"
-        return "Doji"
+    doji = body <= 0.10 * rng
+    hammer = (lower >= 2.0 * body) & (upper <= 0.35 * body)
+    inv_hammer = (upper >= 2.0 * body) & (lower <= 0.35 * body)
+    marubozu = (upper <= 0.10 * rng) & (lower <= 0.10 * rng)
+
+    # First match wins, same precedence as the branch cascade it replaced
+    conditions = [
+        doji & (lower >= 0.60 * rng) & (upper <= 0.15 * rng),
+        doji & (upper >= 0.60 * rng) & (lower <= 0.15 * rng),
+        doji,
+        hammer & bull,
+        hammer,
+        inv_hammer & bull,
+        inv_hammer,
+        marubozu & bull,
+        marubozu,
+        bull,
+        bear,
+    ]
+    return np.select(conditions, np.arange(len(conditions), dtype=np.int8), default=len(conditions)).astype(
+        np.int8, copy=False
+    )
 
-    if lower >= 2.0 * body and upper <= 0.35 * body:
-        return "Bullish Hammer-like" if bull else "Bearish Hanging-Man-like"
 
-    if upper >= 2.0 * body and lower <= 0.35 * body:
-        return "Bullish Inverted Hammer-like" if bull else "Bearish Shooting-Star-like"
+def candlestick_name_vec(o: np.ndarray, h: np.ndarray, l: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """
+    Candle shape label for each bar of the given OHLC arrays.
+    """
+    return CANDLE_NAMES[candlestick_codes(o, h, l, c)]
 
-    if upper <= 0.10 * rng and lower <= 0.10 * rng:
-        return "Bullish Marubozu-like" if bull else "Bearish Marubozu-like"
 
-    if bull:
-        return "Bullish Candle"
-    if bear:
-        return "Bearish Candle"
-    return "Neutral Candle"
+def _count_values(col: pd.Series) -> np.ndarray:
+    """
+    pd.to_numeric(col, errors="coerce").fillna(0).astype(int) without the
+    intermediate columns: integer input passes through, floats take one NaN -> 0 pass.
+    """
+    if col.dtype.kind in "iu":
+        return col.to_numpy(dtype=np.int64)
+    if col.dtype.kind != "f":
+        col = pd.to_numeric(col, errors="coerce")
+    return np.nan_to_num(col.to_numpy(dtype=np.float64), nan=0.0).astype(np.int64)
 
 
+# The metadata loaders below are read once per process (main enriches twice per run);
+# callers must not mutate what they return.
+@functools.lru_cache(maxsize=1)
 def _load_sector_map() -> pd.DataFrame:
     if not os.path.exists(SECTOR_MAP_PATH):
         return pd.DataFrame(columns=["ticker", "sector"])
-    df = pd.read_csv(SECTOR_MAP_PATH)
+    df = pd.read_csv(SECTOR_MAP_PATH, engine="pyarrow")
     if "ticker" not in df.columns or "sector" not in df.columns:
         return pd.DataFrame(columns=["ticker", "sector"])
-    df = df.copy()
-    df["ticker"] = df["ticker"].astype(str).map(_norm_ticker)
+    df["ticker"] = _norm_ticker_series(df["ticker"])
     df["sector"] = df["sector"].astype(str).fillna("Unknown")
     return df[["ticker", "sector"]]
 
 
+@functools.lru_cache(maxsize=1)
 def _load_etf_membership() -> pd.DataFrame:
     if not os.path.exists(ETF_HOLDINGS_PATH):
         return pd.DataFrame(columns=["ticker", "etfs", "etf_count", "etfs_pretty"])
-    df = pd.read_csv(ETF_HOLDINGS_PATH)
+    df = pd.read_csv(ETF_HOLDINGS_PATH, engine="pyarrow")
     if "ticker" not in df.columns:
         return pd.DataFrame(columns=["ticker", "etfs", "etf_count", "etfs_pretty"])
-    df = df.copy()
-    df["ticker"] = df["ticker"].astype(str).map(_norm_ticker)
+    df["ticker"] = _norm_ticker_series(df["ticker"])
     df["etfs"] = df.get("etfs", "").astype(str).fillna("")
     if "etf_count" not in df.columns:
         df["etf_count"] = df["etfs"].apply(lambda x: len([e for e in str(x).split("|") if e]))
-    df["etf_count"] = pd.to_numeric(df["etf_count"], errors="coerce").fillna(0).astype(int)
+    df["etf_count"] = _count_values(df["etf_count"])
     df["etfs_pretty"] = df["etfs"].apply(lambda x: ", ".join([e for e in str(x).split("|") if e]))
     return df[["ticker", "etfs", "etf_count", "etfs_pretty"]]
 
 
+@functools.lru_cache(maxsize=1)
 def _load_industry_map() -> pd.DataFrame:
     if not os.path.exists(STOCKS_BIGGEST_PATH):
         return pd.DataFrame(columns=["ticker", "industry"])
-    df = pd.read_csv(STOCKS_BIGGEST_PATH)
+    df = pd.read_csv(STOCKS_BIGGEST_PATH, engine="pyarrow")
     cols = {c.lower().strip(): c for c in df.columns}
     sym_col = cols.get("symbol")
     ind_col = cols.get("industry")
     if sym_col is None or ind_col is None:
         return pd.DataFrame(columns=["ticker", "industry"])
-    out = df[[sym_col, ind_col]].copy()
-    out.columns = ["ticker", "industry"]
-    out["ticker"] = out["ticker"].astype(str).map(_norm_ticker)
-    out["industry"] = out["industry"].astype(str).fillna("Unknown")
-    return out
+    return pd.DataFrame(
+        {
+            "ticker": _norm_ticker_series(df[sym_col]),
+            "industry": df[ind_col].astype(str).fillna("Unknown"),
+        }
+    )
 
 
-def _sector_etf_lookup() -> dict[str, str]:
-    rev = {}
-    for sec, etfs in SECTOR_TOP_ETFS.items():
-        for e in etfs:
-            rev[_norm_ticker(e)] = sec
-    return rev
+def _ticker_lookup(table: pd.DataFrame, col: str) -> dict:
+    # ticker -> value (a ticker listed twice keeps its last row)
+    return dict(zip(table["ticker"], table[col]))
 
 
 def enrich_df_with_metadata(df: pd.DataFrame) -> pd.DataFrame:
     if df is None or df.empty or "ticker" not in df.columns:
         return df
 
-    df = df.copy()
-    df["ticker"] = df["ticker"].astype(str).map(_norm_ticker)
+    # shallow: every column written below is replaced, never modified in place
+    df = df.copy(deep=False)
+    df["ticker"] = _norm_ticker_series(df["ticker"])
 
     sector_df = _load_sector_map()
     etf_df = _load_etf_membership()
     ind_df = _load_industry_map()
-    sec_etf = _sector_etf_lookup()
+    sec_etf = SECTOR_ETF_LOOKUP
 
+    # One value column per lookup table: a dict probe per row instead of a merge
     if not sector_df.empty:
-        df = df.merge(sector_df, on="ticker", how="left")
+        df["sector"] = df["ticker"].map(_ticker_lookup(sector_df, "sector"))
     else:
         df["sector"] = "Unknown"
     df["sector"] = df["sector"].fillna("Unknown")
 
     if not ind_df.empty:
-        df = df.merge(ind_df, on="ticker", how="left")
+        df["industry"] = df["ticker"].map(_ticker_lookup(ind_df, "industry"))
     else:
         df["industry"] = "Unknown"
     df["industry"] = df["industry"].fillna("Unknown")
 
     # If ticker is one of the sector ETFs (XLB, XLK, etc), enforce sector + industry tag
-    df["sector"] = df.apply(lambda r: sec_etf.get(r["ticker"], r["sector"]), axis=1)
-    df["industry"] = df.apply(lambda r: ("Sector ETF" if r["ticker"] in sec_etf else r["industry"]), axis=1)
+    is_sec_etf = df["ticker"].isin(sec_etf.keys())
+    df["sector"] = df["ticker"].map(sec_etf).fillna(df["sector"])
+    df["industry"] = df["industry"].where(~is_sec_etf, "Sector ETF")
 
     if not etf_df.empty:
-        df = df.merge(etf_df, on="ticker", how="left")
+        for c in ("etfs", "etf_count", "etfs_pretty"):
+            df[c] = df["ticker"].map(_ticker_lookup(etf_df, c))
     else:
         df["etfs"] = ""
         df["etf_count"] = 0
@@ -282,133 +464,210 @@ def enrich_df_with_metadata(df: pd.DataFrame) -> pd.DataFrame:
         df[c] = df[c].fillna("")
     if "etf_count" not in df.columns:
         df["etf_count"] = 0
-    df["etf_count"] = pd.to_numeric(df["etf_count"], errors="coerce").fillna(0).astype(int)
+    df["etf_count"] = _count_values(df["etf_count"])
+
+    return df
+
 
+METADATA_COLUMNS = ["sector", "industry", "etfs", "etf_count", "etfs_pretty"]
+
+
+def _attach_metadata(df: pd.DataFrame, meta: pd.DataFrame) -> pd.DataFrame:
+    """
+    enrich_df_with_metadata(df) from a frame already enriched once per ticker
+    (meta, indexed by the raw ticker).
+    """
+    if df is None or df.empty:
+        return df
+    m = meta.reindex(df["ticker"].to_numpy())
+    df = df.copy(deep=False)
+    df["ticker"] = m["ticker"].to_numpy()
+    for c in METADATA_COLUMNS:
+        df[c] = m[c].to_numpy()
     return df
 
 
-def _write_context_csv(context_rows: list[dict]) -> None:
+def _init_scan_process() -> None:
+    # Workers don't run inside main()'s option_context: forked ones only copy whatever
+    # the option was when they were forked, spawned ones start from pandas defaults
+    pd.set_option("mode.copy_on_write", True)
+
+
+def _scan_executor() -> tuple[Executor, int]:
+    """
+    The scan pool and how many tickers each task scans: process workers take a
+    whole prefetch chunk per task so pickling/IPC is paid per chunk, not per ticker.
+    """
+    if SCAN_USE_PROCESSES:
+        return ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_init_scan_process), BATCH_SIZE
+    return ThreadPoolExecutor(max_workers=SCAN_MAX_WORKERS), 1
+
+
+def _scan_tickers(tickers: list[str], scan_time: str, feeds: list[dict | None]) -> list[tuple]:
+    """
+    scan_ticker over several tickers: (rows, ctx, None) or (None, None, error) per ticker.
+    """
+    out = []
+    for ticker, feeds_in in zip(tickers, feeds):
+        try:
+            rows, ctx = scan_ticker(ticker, scan_time, feeds_in)
+            out.append((rows, ctx, None))
+        except Exception as e:
+            out.append((None, None, e))
+    return out
+
+
+def _ticker_feeds(prefetched: dict[str, dict[str, pd.DataFrame | None]] | None, ticker: str):
+    # interval -> ticker -> OHLC  =>  interval -> OHLC for one ticker (all a scan task needs)
+    if prefetched is None:
+        return None
+    return {interval: by_ticker.get(ticker) for interval, by_ticker in prefetched.items()}
+
+
+def _has_short_history(feeds: dict[str, pd.DataFrame | None] | None) -> bool:
+    """
+    Yahoo answered with a daily history too short to scan (fresh IPO, stub listing).
+    A missing feed is a failed or rate-limited download, not proof the symbol is dead.
+    """
+    daily = feeds.get("1d") if feeds else None
+    return daily is not None and len(daily) < MIN_DAILY_BARS
+
+
+def _write_context_csv(df_ctx: pd.DataFrame) -> None:
     os.makedirs(os.path.dirname(CONTEXT_OUT_PATH), exist_ok=True)
-    pd.DataFrame(context_rows).to_csv(CONTEXT_OUT_PATH, index=False)
+    df_ctx.to_csv(CONTEXT_OUT_PATH, index=False)
 
 
-def scan_ticker(ticker: str, scan_time: str):
-    frames, feeds = build_timeframe_frames(ticker)
-    if "D" not in frames or frames["D"].empty or len(frames["D"]) < 50:
+def scan_ticker(ticker: str, scan_time: str, feeds_in: dict[str, pd.DataFrame | None] | None = None):
+    frames, feeds = build_timeframe_frames(ticker, feeds_in, min_daily_bars=MIN_DAILY_BARS)
+    df_d = frames.get("D")
+    if df_d is None or len(df_d) < MIN_DAILY_BARS:
         return [], None
 
-    current_price = get_current_price(feeds)
-    px = round(float(current_price), 2) if current_price is not None else None
+    px = get_current_price(feeds)
 
-    classified: dict[str, pd.DataFrame] = {}
+    # One pass per timeframe: classify + resolve the last closed bar, reused by context and setups.
+    # Strat codes ride alongside the (sorted, unmodified) frames instead of a classified copy of each.
+    codes: dict[str, np.ndarray] = {}
+    closed_idx: dict[str, int] = {}
+    now = pd.Timestamp.now(tz=NY)
     for tf, df in frames.items():
-        if df is None or df.empty or len(df) < 3:
+        if len(df) < 3:
             continue
-        df2 = classify_strat_candles(df)
-        df2 = df2.sort_values("timestamp").reset_index(drop=True)
-        classified[tf] = df2
+        codes[tf] = classify_strat_codes(df["high"].to_numpy(), df["low"].to_numpy())
+        closed_idx[tf] = last_closed_index(tf, df, now=now)
 
     # Confirmed (CLOSED) context for setups/bias score
+    closed_codes = np.array(
+        [codes[tf][closed_idx[tf]] if tf in closed_idx else -1 for tf in BIAS_TFS], dtype=np.int8
+    )
     ctx_closed = {}
-    for tf in ("Y", "Q", "M", "W", "D"):
-        df_tf = classified.get(tf)
-        if df_tf is None or df_tf.empty or len(df_tf) < 3:
+    for tf, code in zip(BIAS_TFS, closed_codes):
+        if tf not in closed_idx:
             continue
-        idx = last_closed_index(tf, df_tf)
-        ctx_closed[tf] = str(df_tf.iloc[idx]["strat"])
+        ctx_closed[tf] = str(STRAT_LABELS[code])
 
     # Live (CURRENT BAR) context for heatmap
     ctx_live = {}
-    for tf in ("Y", "Q", "M", "W", "D"):
-        df_tf = classified.get(tf)
-        if df_tf is None or df_tf.empty or len(df_tf) < 2:
+    for tf in BIAS_TFS:
+        if tf not in codes:
             continue
         # current bar strat (can repaint)
-        v = df_tf.iloc[-1]["strat"]
-        ctx_live[tf] = str(v) if pd.notna(v) else None
+        ctx_live[tf] = STRAT_LABELS[codes[tf][-1]]
 
-    bias_score = compute_bias_score(ctx_closed)
+    bias_score = compute_bias_score(closed_codes)
 
     # Context row (for heatmap)
-    context_row = {
-        "scan_time": scan_time,
-        "ticker": ticker,
-        "current_price": px,
-
-        "ctx_Y_closed": ctx_closed.get("Y"),
-        "ctx_Q_closed": ctx_closed.get("Q"),
-        "ctx_M_closed": ctx_closed.get("M"),
-        "ctx_W_closed": ctx_closed.get("W"),
-        "ctx_D_closed": ctx_closed.get("D"),
-
-        "ctx_Y_live": ctx_live.get("Y"),
-        "ctx_Q_live": ctx_live.get("Q"),
-        "ctx_M_live": ctx_live.get("M"),
-        "ctx_W_live": ctx_live.get("W"),
-        "ctx_D_live": ctx_live.get("D"),
-
-        "score": int(bias_score),
-    }
+    context_row = ContextRow(
+        scan_time=scan_time,
+        ticker=ticker,
+        current_price=px,
+
+        ctx_Y_closed=ctx_closed.get("Y"),
+        ctx_Q_closed=ctx_closed.get("Q"),
+        ctx_M_closed=ctx_closed.get("M"),
+        ctx_W_closed=ctx_closed.get("W"),
+        ctx_D_closed=ctx_closed.get("D"),
+
+        ctx_Y_live=ctx_live.get("Y"),
+        ctx_Q_live=ctx_live.get("Q"),
+        ctx_M_live=ctx_live.get("M"),
+        ctx_W_live=ctx_live.get("W"),
+        ctx_D_live=ctx_live.get("D"),
+
+        score=int(bias_score),
+    )
 
     rows = []
     for tf in TARGET_TFS:
-        df_tf = classified.get(tf)
-        if df_tf is None or df_tf.empty or len(df_tf) < 3:
+        if tf not in codes:
             continue
 
-        signals = analyze_last_closed_setups(df_tf, tf)
+        # Setups must remain LAST CLOSED (no repaint)
+        signals = [
+            sig for sig in analyze_last_closed_setups(frames[tf], tf, last_idx=closed_idx[tf], codes=codes[tf])
+            if getattr(sig, "kind", "") != "TRIGGERED"
+        ]
         if not signals:
             continue
 
-        for sig in signals:
-            # Setups must remain LAST CLOSED (no repaint)
-            if getattr(sig, "kind", "") == "TRIGGERED":
-                continue
+        candle_types = candlestick_name_vec(
+            [sig.last_open for sig in signals],
+            [sig.last_high for sig in signals],
+            [sig.last_low for sig in signals],
+            [sig.last_close for sig in signals],
+        )
 
+        for sig, last_candle_type in zip(signals, candle_types.tolist()):
             chart_url = f"https://finance.yahoo.com/quote/{ticker}/chart"
 
             aligned = None
             if sig.direction in ("bull", "bear"):
                 aligned = (bias_score > 0) if sig.direction == "bull" else (bias_score < 0)
 
-            last_candle_type = candlestick_name(sig.last_open, sig.last_high, sig.last_low, sig.last_close)
-
             rows.append(
-                {
-                    "scan_time": scan_time,
-                    "ticker": ticker,
-                    "chart_url": chart_url,
-                    "current_price": px,
-
-                    "tf": sig.tf,
-                    "pattern": sig.pattern,
-                    "setup": sig.setup,
-                    "dir": sig.direction,
-
-                    "entry": round(float(sig.entry), 2) if sig.entry is not None else None,
-                    "stop": round(float(sig.stop), 2) if sig.stop is not None else None,
-
-                    "score": int(bias_score),
-                    "aligned": aligned,
-
-                    "last_strat": sig.last_strat,
-                    "last_candle_type": last_candle_type,
-
-                    "actionable": sig.actionable,
-                    "note": sig.note,
-
-                    "ctx_Y": ctx_closed.get("Y"),
-                    "ctx_Q": ctx_closed.get("Q"),
-                    "ctx_M": ctx_closed.get("M"),
-                    "ctx_W": ctx_closed.get("W"),
-                    "ctx_D": ctx_closed.get("D"),
-                }
+                ScanRow(
+                    scan_time=scan_time,
+                    ticker=ticker,
+                    chart_url=chart_url,
+                    current_price=px,
+
+                    tf=sig.tf,
+                    pattern=sig.pattern,
+                    setup=sig.setup,
+                    dir=sig.direction,
+
+                    entry=sig.entry,
+                    stop=sig.stop,
+
+                    score=int(bias_score),
+                    aligned=aligned,
+
+                    last_strat=sig.last_strat,
+                    last_candle_type=last_candle_type,
+
+                    actionable=sig.actionable,
+                    note=sig.note,
+
+                    ctx_Y=ctx_closed.get("Y"),
+                    ctx_Q=ctx_closed.get("Q"),
+                    ctx_M=ctx_closed.get("M"),
+                    ctx_W=ctx_closed.get("W"),
+                    ctx_D=ctx_closed.get("D"),
+                )
             )
 
     return rows, context_row
 
 
 def main():
+    # Slices/column picks of the cached frames stay views until something writes to them.
+    # Scoped to the scan so modules importing main keep their own pandas semantics.
+    with pd.option_context("mode.copy_on_write", True):
+        _run_scan()
+
+
+def _run_scan():
     scan_time = (
         pd.Timestamp.now(tz=ZoneInfo("America/New_York"))
         .strftime("%Y-%m-%d %H:%M:%S %Z")
@@ -419,33 +678,93 @@ def main():
         tickers = tickers[:DEV_TICKERS_LIMIT]
         print("\n[Universe] DEV mode active\n")
 
+    # Skip tickers that recently had too short a daily history (fresh IPOs, stub listings)
+    skip = load_unscannable()
+    if skip:
+        n_before = len(tickers)
+        tickers = [t for t in tickers if t not in skip]
+        print(f"[Universe] skipping {n_before - len(tickers)} recently unscannable tickers")
+
     print(f"Scan time: {scan_time}")
     print(f"Scanning {len(tickers)} tickers...\n")
 
+    # Frames batched in a previous run of this process are stale by now
+    clear_memory_cache()
+
     all_rows = []
     context_rows = []
+    unscannable = []
 
-    for ticker in tickers:
+    # Download -> scan pipeline: a downloader thread fetches the universe chunk by chunk
+    # while the pool already scans the chunks that have landed.
+    chunks: "queue.Queue[tuple[list[str], dict | None] | None]" = queue.Queue(maxsize=PREFETCH_QUEUE_SIZE)
+
+    def _download_chunks():
         try:
-            rows, ctx = scan_ticker(ticker, scan_time)
-            all_rows.extend(rows)
-            if ctx:
-                context_rows.append(ctx)
-        except Exception as e:
-            print(f"Error scanning {ticker}: {e}")
+            for i in range(0, len(tickers), BATCH_SIZE):
+                chunk = tickers[i : i + BATCH_SIZE]
+                try:
+                    chunks.put((chunk, prefetch_base_feeds(chunk)))
+                except Exception as e:
+                    # scan_ticker falls back to per-ticker load_ohlc (its downloads take the
+                    # same yf.download lock as the prefetch thread)
+                    print(f"Error prefetching {chunk[0]}..{chunk[-1]}: {e}")
+                    chunks.put((chunk, None))
+        finally:
+            chunks.put(None)
+
+    downloader = threading.Thread(target=_download_chunks, name="prefetch", daemon=True)
+    downloader.start()
+
+    # Results are consumed in universe order so the snapshot stays stable run to run
+    # (chunks arrive in universe order).
+    ex, task_size = _scan_executor()
+    with ex:
+        futures = []
+        while (item := chunks.get()) is not None:
+            chunk, prefetched = item
+            for i in range(0, len(chunk), task_size):
+                task = chunk[i : i + task_size]
+                feeds = [_ticker_feeds(prefetched, ticker) for ticker in task]
+                futures.append((task, feeds, ex.submit(_scan_tickers, task, scan_time, feeds)))
+        downloader.join()
+
+        for task, feeds, fut in futures:
+            try:
+                results = fut.result()
+            except Exception as e:
+                results = [(None, None, e)] * len(task)
+            for ticker, ticker_feeds, (rows, ctx, err) in zip(task, feeds, results):
+                if err is not None:
+                    print(f"Error scanning {ticker}: {err}")
+                    continue
+                if ctx is None and not rows:
+                    if _has_short_history(ticker_feeds):
+                        unscannable.append(ticker)
+                    continue
+                all_rows.extend(rows)
+                if ctx:
+                    context_rows.append(ctx)
+
+    # Most of the universe coming back empty means Yahoo failed, not that the tickers are dead
+    if unscannable and len(unscannable) < len(tickers) // 2:
+        record_unscannable(unscannable)
 
     # Enrich with sector/industry/etf membership for UI filtering + heatmaps
-    df_rows = enrich_df_with_metadata(pd.DataFrame(all_rows)) if all_rows else pd.DataFrame()
-    df_ctx = enrich_df_with_metadata(pd.DataFrame(context_rows)) if context_rows else pd.DataFrame()
+    # (once per ticker, then attached to both outputs)
+    scanned = pd.unique(pd.Series([r.ticker for r in context_rows] + [r.ticker for r in all_rows], dtype=object))
+    meta = enrich_df_with_metadata(pd.DataFrame({"ticker": scanned}))
+    if not meta.empty:
+        meta.index = scanned
 
-    all_rows_out = df_rows.to_dict(orient="records") if not df_rows.empty else []
-    ctx_out = df_ctx.to_dict(orient="records") if not df_ctx.empty else []
+    df_rows = _attach_metadata(_rows_frame(all_rows, ScanRow), meta) if all_rows else pd.DataFrame()
+    df_ctx = _attach_metadata(_rows_frame(context_rows, ContextRow), meta) if context_rows else pd.DataFrame()
 
-    write_snapshot(all_rows_out)
-    _write_context_csv(ctx_out)
+    write_snapshot(df_rows)
+    _write_context_csv(df_ctx)
 
-    print(f"\nSnapshot written: {len(all_rows_out)} rows")
-    print(f"Context written: {len(ctx_out)} tickers -> {CONTEXT_OUT_PATH}\n")
+    print(f"\nSnapshot written: {len(df_rows)} rows")
+    print(f"Context written: {len(df_ctx)} tickers -> {CONTEXT_OUT_PATH}\n")
 
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import json
 import os
 from dataclasses import dataclass
@@ -11,7 +12,7 @@ import pandas as pd
 from zoneinfo import ZoneInfo
 
 from loaders.yahoo import load_ohlc
-from timeframes.resample import resample_timeframe
+from timeframes.resample import resample_timeframes
 
 ET = ZoneInfo("America/New_York")
 
@@ -26,6 +27,9 @@ CLOSE_MINUTE = 30  # 4:30pm ET
 META_DIR = os.path.join("cache", "meta")
 LAST_RUN_PATH = os.path.join(META_DIR, "last_run.json")
 
+# last_run.json as last read/written by this process (it is the only writer)
+_last_run_cache: Optional[Dict[str, str]] = None
+
 
 @dataclass
 class TFState:
@@ -37,7 +41,7 @@ def _ensure_dirs():
     os.makedirs(META_DIR, exist_ok=True)
 
 
-def _load_last_run() -> Dict[str, str]:
+def _read_last_run() -> Dict[str, str]:
     _ensure_dirs()
     if not os.path.exists(LAST_RUN_PATH):
         return {}
@@ -48,10 +52,20 @@ def _load_last_run() -> Dict[str, str]:
         return {}
 
 
+def _load_last_run() -> Dict[str, str]:
+    # Read once per process; callers get their own copy to modify
+    global _last_run_cache
+    if _last_run_cache is None:
+        _last_run_cache = _read_last_run()
+    return dict(_last_run_cache)
+
+
 def _save_last_run(state: Dict[str, str]) -> None:
+    global _last_run_cache
     _ensure_dirs()
     with open(LAST_RUN_PATH, "w", encoding="utf-8") as f:
         json.dump(state, f, indent=2, sort_keys=True)
+    _last_run_cache = dict(state)
 
 
 def _to_ts(x) -> Optional[pd.Timestamp]:
@@ -72,23 +86,30 @@ def _close_dt_for_period_end(ts: pd.Timestamp) -> pd.Timestamp:
     return pd.Timestamp(year=d.year, month=d.month, day=d.day, hour=CLOSE_HOUR, minute=CLOSE_MINUTE, tz=ET)
 
 
+def _to_et(ts) -> pd.Timestamp:
+    """
+    Timestamp in ET; naive timestamps are taken to already be ET.
+    """
+    ts = pd.Timestamp(ts)
+    if ts.tzinfo is None:
+        return ts.tz_localize(ET)
+    if ts.tzinfo == ET:
+        return ts
+    return ts.tz_convert(ET)
+
+
 def _last_closed_idx_intraday(df: pd.DataFrame, tf: str) -> int:
     """
     For intraday bars: last row is closed if now >= last_ts + duration.
-    If not, use -2.
+    If not, use -2. df must be sorted by timestamp.
     """
-    df = df.sort_values("timestamp").reset_index(drop=True)
     if len(df) < 3:
         return -2
 
     now = pd.Timestamp.now(tz=ET)
 
     # Convert last timestamp to ET for comparison
-    last_ts = pd.to_datetime(df.iloc[-1]["timestamp"])
-    if last_ts.tzinfo is None:
-        last_ts = last_ts.tz_localize(ET)
-    else:
-        last_ts = last_ts.tz_convert(ET)
+    last_ts = _to_et(df["timestamp"].iat[-1])
 
     dur_map = {
         "5M": pd.Timedelta(minutes=5),
@@ -114,17 +135,12 @@ def _last_closed_idx_higher(df: pd.DataFrame, tf: str) -> int:
     It's closed only if now >= (period_end_date @ 4:30pm ET).
     Otherwise it’s in-progress and we use the previous row (-2).
     """
-    df = df.sort_values("timestamp").reset_index(drop=True)
     if len(df) < 3:
         return -2
 
     now = pd.Timestamp.now(tz=ET)
 
-    last_ts = pd.to_datetime(df.iloc[-1]["timestamp"])
-    if last_ts.tzinfo is None:
-        last_ts = last_ts.tz_localize(ET)
-    else:
-        last_ts = last_ts.tz_convert(ET)
+    last_ts = _to_et(df["timestamp"].iat[-1])
 
     close_dt = _close_dt_for_period_end(last_ts)
     if now < close_dt:
@@ -137,18 +153,17 @@ def _compute_last_closed_ts(frames: Dict[str, pd.DataFrame], tf: str) -> Optiona
     if df is None or df.empty or "timestamp" not in df.columns or len(df) < 3:
         return None
 
+    # Resampled frames arrive sorted; only reorder the odd frame that is not
+    if not df["timestamp"].is_monotonic_increasing:
+        df = df.sort_values("timestamp").reset_index(drop=True)
+
     tfu = tf.upper()
     if tfu in ("5M", "10M", "15M", "30M", "1H", "2H", "3H", "4H"):
         idx = _last_closed_idx_intraday(df, tfu)
     else:
         idx = _last_closed_idx_higher(df, tfu)
 
-    ts = pd.to_datetime(df.iloc[idx]["timestamp"])
-    if ts.tzinfo is None:
-        ts = ts.tz_localize(ET)
-    else:
-        ts = ts.tz_convert(ET)
-    return ts
+    return _to_et(df["timestamp"].iat[idx])
 
 
 def _build_reference_frames() -> Dict[str, pd.DataFrame]:
@@ -164,28 +179,34 @@ def _build_reference_frames() -> Dict[str, pd.DataFrame]:
 
     frames: Dict[str, pd.DataFrame] = {}
 
-    if df_1d is not None and not df_1d.empty:
-        frames["D"] = df_1d
-        frames["W"] = resample_timeframe(df_1d, "W")
-        frames["M"] = resample_timeframe(df_1d, "M")
-        frames["Q"] = resample_timeframe(df_1d, "Q")
-        frames["Y"] = resample_timeframe(df_1d, "Y")
-
-    if df_60 is not None and not df_60.empty:
-        frames["1H"] = df_60
-        frames["2H"] = resample_timeframe(df_60, "2H")
-        frames["3H"] = resample_timeframe(df_60, "3H")
-        frames["4H"] = resample_timeframe(df_60, "4H")
-
-    if df_5m is not None and not df_5m.empty:
-        frames["5M"] = df_5m
-        frames["10M"] = resample_timeframe(df_5m, "10M")
-        frames["15M"] = resample_timeframe(df_5m, "15M")
-        frames["30M"] = resample_timeframe(df_5m, "30M")
+    # Each base is parsed/binned once for all of its derived timeframes
+    for base_tf, df, derived in (
+        ("D", df_1d, ["W", "M", "Q", "Y"]),
+        ("1H", df_60, ["2H", "3H", "4H"]),
+        ("5M", df_5m, ["10M", "15M", "30M"]),
+    ):
+        if df is None:
+            continue
+        frames[base_tf] = df
+        frames.update(resample_timeframes(df, derived))
 
     return frames
 
 
+@functools.lru_cache(maxsize=1)
+def _reference_frames_for(bucket: pd.Timestamp) -> Dict[str, pd.DataFrame]:
+    return _build_reference_frames()
+
+
+def _reference_frames() -> Dict[str, pd.DataFrame]:
+    """
+    _build_reference_frames shared within a 5-minute bucket, so should_run_for_any_timeframe
+    and record_timeframes_run in the same tick load + resample once.
+    Callers must not mutate the frames.
+    """
+    return _reference_frames_for(pd.Timestamp.now(tz=ET).floor("5min"))
+
+
 def should_run_for_any_timeframe(target_tfs: List[str]) -> Tuple[bool, Dict[str, str]]:
     """
     Returns:
@@ -193,7 +214,7 @@ def should_run_for_any_timeframe(target_tfs: List[str]) -> Tuple[bool, Dict[str,
     If any timeframe has a newer last-closed bar than what we recorded, we should run.
     """
     last_run = _load_last_run()
-    frames = _build_reference_frames()
+    frames = _reference_frames()
 
     debug = {}
     any_new = False
@@ -221,7 +242,7 @@ def record_timeframes_run(target_tfs: List[str]) -> None:
     After a successful scan, record the current last-closed timestamp per TF.
     """
     last_run = _load_last_run()
-    frames = _build_reference_frames()
+    frames = _reference_frames()
 
     for tf in target_tfs:
         ts = _compute_last_closed_ts(frames, tf)
@@ -14,6 +14,9 @@ WEIGHTS = {
 BULL = {"2U"}
 BEAR = {"2D"}
 
+# strat type -> vote sign (anything else votes 0)
+SIGN = {**{s: +1 for s in BULL}, **{s: -1 for s in BEAR}}
+
 
 def continuity_bias(context: Dict[str, str]) -> Tuple[str, int, Dict[str, int]]:
     """
@@ -24,19 +27,8 @@ def continuity_bias(context: Dict[str, str]) -> Tuple[str, int, Dict[str, int]]:
       bias_score: non-negative int magnitude (strength of continuity)
       tf_votes: per-tf signed votes (for debugging / transparency)
     """
-    tf_votes: Dict[str, int] = {}
-    total = 0
-
-    for tf, w in WEIGHTS.items():
-        s = context.get(tf)
-        if s in BULL:
-            tf_votes[tf] = +w
-            total += w
-        elif s in BEAR:
-            tf_votes[tf] = -w
-            total -= w
-        else:
-            tf_votes[tf] = 0
+    tf_votes: Dict[str, int] = {tf: SIGN.get(context.get(tf), 0) * w for tf, w in WEIGHTS.items()}
+    total = sum(tf_votes.values())
 
     if total > 0:
         return "bull", abs(total), tf_votes
@@ -1,69 +1,62 @@
+import numpy as np
 import pandas as pd
 
+from strat.classify import STRAT_1, STRAT_2D, STRAT_2U, STRAT_3, code_windows, strat_codes, window_index
 
-def detect_strat_setups(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Detects STRAT combos and adds a 'setup' column
-    """
-
-    df = df.copy().reset_index(drop=True)
-    df["setup"] = None
-
-    for i in range(2, len(df)):
-        a = df.loc[i - 2, "strat"]
-        b = df.loc[i - 1, "strat"]
-        c = df.loc[i, "strat"]
 
+def _combo_labels(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    # a, b, c = strat codes of bars i-2, i-1, i
+    # First match wins, same order as the original elif chain
+    rules = [
         # 2-1-2 Continuations
-        if a == "2U" and b == "1" and c == "2U":
-            df.loc[i, "setup"] = "2-1-2 Bullish Continuation"
-        elif a == "2D" and b == "1" and c == "2D":
-            df.loc[i, "setup"] = "2-1-2 Bearish Continuation"
-
+        ((a == STRAT_2U) & (b == STRAT_1) & (c == STRAT_2U), "2-1-2 Bullish Continuation"),
+        ((a == STRAT_2D) & (b == STRAT_1) & (c == STRAT_2D), "2-1-2 Bearish Continuation"),
         # 2-1-2 Reversals
-        elif a == "2D" and b == "1" and c == "2U":
-            df.loc[i, "setup"] = "2-1-2 Bullish Reversal"
-        elif a == "2U" and b == "1" and c == "2D":
-            df.loc[i, "setup"] = "2-1-2 Bearish Reversal"
-
+        ((a == STRAT_2D) & (b == STRAT_1) & (c == STRAT_2U), "2-1-2 Bullish Reversal"),
+        ((a == STRAT_2U) & (b == STRAT_1) & (c == STRAT_2D), "2-1-2 Bearish Reversal"),
         # 3-1-2 Reversals
-        elif a == "3" and b == "1" and c == "2U":
-            df.loc[i, "setup"] = "3-1-2 Bullish Reversal"
-        elif a == "3" and b == "1" and c == "2D":
-            df.loc[i, "setup"] = "3-1-2 Bearish Reversal"
-
+        ((a == STRAT_3) & (b == STRAT_1) & (c == STRAT_2U), "3-1-2 Bullish Reversal"),
+        ((a == STRAT_3) & (b == STRAT_1) & (c == STRAT_2D), "3-1-2 Bearish Reversal"),
         # 1-Bar Reversal
-        elif b == "1" and c == "3":
-            df.loc[i, "setup"] = "1-Bar Reversal"
-
+        ((b == STRAT_1) & (c == STRAT_3), "1-Bar Reversal"),
         # 1-2 Reversals
-        elif b == "1" and c == "2U":
-            df.loc[i, "setup"] = "1-2 Bullish Reversal"
-        elif b == "1" and c == "2D":
-            df.loc[i, "setup"] = "1-2 Bearish Reversal"
-
+        ((b == STRAT_1) & (c == STRAT_2U), "1-2 Bullish Reversal"),
+        ((b == STRAT_1) & (c == STRAT_2D), "1-2 Bearish Reversal"),
         # 2-2 Continuations
-        elif a == "2U" and b == "2U":
-            df.loc[i, "setup"] = "2-2 Bullish Continuation"
-        elif a == "2D" and b == "2D":
-            df.loc[i, "setup"] = "2-2 Bearish Continuation"
-
+        ((a == STRAT_2U) & (b == STRAT_2U), "2-2 Bullish Continuation"),
+        ((a == STRAT_2D) & (b == STRAT_2D), "2-2 Bearish Continuation"),
         # 2-2 Reversals
-        elif a == "2D" and b == "2U":
-            df.loc[i, "setup"] = "2-2 Bullish Reversal"
-        elif a == "2U" and b == "2D":
-            df.loc[i, "setup"] = "2-2 Bearish Reversal"
-
+        ((a == STRAT_2D) & (b == STRAT_2U), "2-2 Bullish Reversal"),
+        ((a == STRAT_2U) & (b == STRAT_2D), "2-2 Bearish Reversal"),
         # 3-2-2 Reversals
-        elif a == "3" and b == "2U" and c == "2U":
-            df.loc[i, "setup"] = "3-2-2 Bullish Reversal"
-        elif a == "3" and b == "2D" and c == "2D":
-            df.loc[i, "setup"] = "3-2-2 Bearish Reversal"
-
+        ((a == STRAT_3) & (b == STRAT_2U) & (c == STRAT_2U), "3-2-2 Bullish Reversal"),
+        ((a == STRAT_3) & (b == STRAT_2D) & (c == STRAT_2D), "3-2-2 Bearish Reversal"),
         # Rev Strat 1-2-2
-        elif a == "1" and b == "2U" and c == "2U":
-            df.loc[i, "setup"] = "Rev Strat 1-2-2 Bullish"
-        elif a == "1" and b == "2D" and c == "2D":
-            df.loc[i, "setup"] = "Rev Strat 1-2-2 Bearish"
+        ((a == STRAT_1) & (b == STRAT_2U) & (c == STRAT_2U), "Rev Strat 1-2-2 Bullish"),
+        ((a == STRAT_1) & (b == STRAT_2D) & (c == STRAT_2D), "Rev Strat 1-2-2 Bearish"),
+    ]
+    return np.select([m for m, _ in rules], [np.array(s, dtype=object) for _, s in rules], default=None)
+
+
+# Label for every possible (i-2, i-1, i) code window, indexed by window_index(codes, 3)
+_COMBO_LABELS = _combo_labels(*code_windows(3))
+
+
+def strat_setup_labels(codes: np.ndarray) -> np.ndarray:
+    """
+    STRAT combo label (or None) per bar, from the bars' strat codes.
+    """
+    setup = np.full(len(codes), None, dtype=object)
+    if len(codes) > 2:
+        setup[2:] = _COMBO_LABELS[window_index(codes, 3)]
+    return setup
+
+
+def detect_strat_setups(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Detects STRAT combos and adds a 'setup' column
+    """
 
+    df = df.reset_index(drop=True)
+    df["setup"] = strat_setup_labels(strat_codes(df["strat"]))
     return df
@@ -3,6 +3,11 @@
 import os
 import json
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Low-cardinality string columns stored dictionary-encoded in latest.parquet
+DICTIONARY_COLUMNS = ("ticker", "tf", "pattern", "setup", "dir", "last_strat", "last_candle_type", "sector", "industry")
 
 
 def _atomic_write_text(path: str, text: str) -> None:
@@ -12,17 +17,41 @@ def _atomic_write_text(path: str, text: str) -> None:
     os.replace(tmp, path)
 
 
+def _atomic_write_parquet(path: str, table: pa.Table) -> None:
+    tmp = path + ".tmp"
+    pq.write_table(
+        table,
+        tmp,
+        compression="snappy",
+        use_dictionary=[c for c in DICTIONARY_COLUMNS if c in table.column_names],
+    )
+    os.replace(tmp, path)
+
+
 def write_snapshot(rows, out_dir="cache/results"):
+    """
+    rows: the snapshot DataFrame (or a list of row dicts).
+    """
     os.makedirs(out_dir, exist_ok=True)
 
     json_path = os.path.join(out_dir, "latest.json")
     csv_path = os.path.join(out_dir, "latest.csv")
+    parquet_path = os.path.join(out_dir, "latest.parquet")
+
+    if isinstance(rows, pd.DataFrame):
+        df = rows
+        records = df.to_dict(orient="records") if not df.empty else []
+    else:
+        df = pd.DataFrame(rows) if rows else pd.DataFrame([])
+        records = rows
 
     # JSON (atomic)
-    json_text = json.dumps(rows, ensure_ascii=False, indent=2, default=str)
+    json_text = json.dumps(records, ensure_ascii=False, indent=2, default=str)
     _atomic_write_text(json_path, json_text)
 
     # CSV (atomic)
-    df = pd.DataFrame(rows) if rows else pd.DataFrame([])
-    csv_text = df.to_csv(index=False)
-    _atomic_write_text(csv_path, csv_text)
+    _atomic_write_text(csv_path, df.to_csv(index=False))
+
+    # Parquet (atomic): the columnar copy for readers that filter/project
+    # (e.g. filters=[("tf", "=", "D")])
+    _atomic_write_parquet(parquet_path, pa.Table.from_pandas(df, preserve_index=False))
@@ -1,5 +1,42 @@
+import numpy as np
 import pandas as pd
 
+from strat.classify import STRAT_1, STRAT_2D, STRAT_2U, STRAT_3, code_windows, strat_codes, window_index
+
+
+def _action_table(prev2: np.ndarray, prev1: np.ndarray) -> np.ndarray:
+    conds = [
+        # 2 → 1 (Break Setup)
+        (prev2 == STRAT_2U) & (prev1 == STRAT_1),
+        (prev2 == STRAT_2D) & (prev1 == STRAT_1),
+        # 3 → 1 (Expansion Play)
+        (prev2 == STRAT_3) & (prev1 == STRAT_1),
+        # 1 → 1 (Coil)
+        (prev2 == STRAT_1) & (prev1 == STRAT_1),
+    ]
+    choices = [
+        np.array(s, dtype=object)
+        for s in ("2-1 (2U → Break)", "2-1 (2D → Break)", "3-1 Expansion", "1-1 Coil")
+    ]
+    return np.select(conds, choices, default=None)
+
+
+# Action type for every possible (i-2, i-1) code pair, indexed by window_index(codes, 2)
+_ACTION_TYPES = _action_table(*code_windows(2))
+
+
+def action_types(codes: np.ndarray) -> np.ndarray:
+    """
+    Actionable type (or None) per bar, from the bars' strat codes.
+    """
+    action_type = np.full(len(codes), None, dtype=object)
+
+    # Candle i is judged on i-2 and i-1 (both CLOSED), so rows 0 and 1 never qualify
+    if len(codes) > 2:
+        action_type[2:] = _ACTION_TYPES[window_index(codes[:-1], 2)]
+
+    return action_type
+
 
 def detect_actionable(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -11,38 +48,8 @@ def detect_actionable(df: pd.DataFrame) -> pd.DataFrame:
     - Mark candle i as actionable
     """
 
-    df = df.copy().reset_index(drop=True)
-
-    df["actionable"] = False
-    df["action_type"] = None
-
-    # We start at i = 2 so i-2 and i-1 both exist
-    for i in range(2, len(df)):
-
-        prev2 = df.loc[i - 2]  # CLOSED
-        prev1 = df.loc[i - 1]  # CLOSED
-        curr = df.loc[i]       # CURRENT (action candle)
-
-        # -------------------------
-        # 2 → 1 (Break Setup)
-        # -------------------------
-        if prev2["strat"] in ["2U", "2D"] and prev1["strat"] == "1":
-            df.loc[i, "actionable"] = True
-            direction = "2U → Break" if prev2["strat"] == "2U" else "2D → Break"
-            df.loc[i, "action_type"] = f"2-1 ({direction})"
-
-        # -------------------------
-        # 3 → 1 (Expansion Play)
-        # -------------------------
-        elif prev2["strat"] == "3" and prev1["strat"] == "1":
-            df.loc[i, "actionable"] = True
-            df.loc[i, "action_type"] = "3-1 Expansion"
-
-        # -------------------------
-        # 1 → 1 (Coil)
-        # -------------------------
-        elif prev2["strat"] == "1" and prev1["strat"] == "1":
-            df.loc[i, "actionable"] = True
-            df.loc[i, "action_type"] = "1-1 Coil"
-
+    df = df.reset_index(drop=True)
+    action_type = action_types(strat_codes(df["strat"]))
+    df["actionable"] = pd.notna(action_type)
+    df["action_type"] = action_type
     return df
@@ -1,37 +1,86 @@
 # strat/classify.py
+import numpy as np
 import pandas as pd
 
+# STRAT candle types in code order (code -1 = not classified, i.e. the first bar)
+STRAT_TYPES = ("1", "2U", "2D", "3")
+STRAT_DTYPE = pd.CategoricalDtype(list(STRAT_TYPES))
+STRAT_1, STRAT_2U, STRAT_2D, STRAT_3 = range(len(STRAT_TYPES))
 
-def classify_strat_candles(df: pd.DataFrame) -> pd.DataFrame:
+
+def strat_codes(strat: pd.Series) -> np.ndarray:
     """
-    Adds STRAT candle type:
-    1  = Inside bar
-    2U = Directional up
-    2D = Directional down
-    3  = Outside bar
+    int8 codes of a "strat" column (index into STRAT_TYPES, -1 for None).
     """
+    return pd.Categorical(strat, dtype=STRAT_DTYPE).codes
 
-    df = df.copy().reset_index(drop=True)
-    df["strat"] = None
 
-    for i in range(1, len(df)):
-        prev = df.loc[i - 1]
-        curr = df.loc[i]
+def code_windows(width: int) -> tuple:
+    """
+    Every combination of `width` strat codes (-1 included) as `width` aligned arrays,
+    ordered so combination k is the one window_index() maps to k. Used to prebuild
+    label tables over all bar windows at import time.
+    """
+    codes = np.arange(-1, len(STRAT_TYPES), dtype=np.int8)
+    return tuple(g.ravel() for g in np.meshgrid(*([codes] * width), indexing="ij"))
+
 
-        # Inside bar
-        if curr["high"] <= prev["high"] and curr["low"] >= prev["low"]:
-            df.loc[i, "strat"] = "1"
+def window_index(codes: np.ndarray, width: int) -> np.ndarray:
+    """
+    Table index (see code_windows) of each run of `width` consecutive strat codes,
+    one per bar from bar width-1 on.
+    """
+    base = len(STRAT_TYPES) + 1
+    k = np.asarray(codes, dtype=np.intp) + 1
+    n = len(k) - width + 1
+    idx = np.zeros(max(n, 0), dtype=np.intp)
+    for j in range(width):
+        idx = idx * base + k[j : j + n]
+    return idx
 
-        # Outside bar
-        elif curr["high"] > prev["high"] and curr["low"] < prev["low"]:
-            df.loc[i, "strat"] = "3"
 
-        # Directional up
-        elif curr["high"] > prev["high"]:
-            df.loc[i, "strat"] = "2U"
+def strat_label(code: int) -> str:
+    """
+    Text form of one strat code ("None" for an unclassified bar).
+    """
+    return STRAT_TYPES[code] if code >= 0 else "None"
 
-        # Directional down
-        elif curr["low"] < prev["low"]:
-            df.loc[i, "strat"] = "2D"
 
+def classify_strat_codes(high: np.ndarray, low: np.ndarray) -> np.ndarray:
+    """
+    int8 strat code per bar from its high/low vs the previous bar's (-1 for the
+    first bar and for bars no rule matches, e.g. NaN prices).
+    """
+    h = np.asarray(high, dtype=np.float64)
+    l = np.asarray(low, dtype=np.float64)
+    codes = np.full(len(h), -1, dtype=np.int8)
+    if len(h) > 1:
+        ch, cl, ph, pl = h[1:], l[1:], h[:-1], l[:-1]
+        # First match wins: inside, outside, directional up, directional down
+        codes[1:] = np.select(
+            [
+                (ch <= ph) & (cl >= pl),
+                (ch > ph) & (cl < pl),
+                ch > ph,
+                cl < pl,
+            ],
+            [STRAT_1, STRAT_3, STRAT_2U, STRAT_2D],
+            default=-1,
+        )
+    return codes
+
+
+def classify_strat_candles(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Adds STRAT candle type as a categorical "strat" column (STRAT_DTYPE; int8 codes
+    underneath, missing for the first bar):
+    1  = Inside bar
+    2U = Directional up
+    2D = Directional down
+    3  = Outside bar
+    """
+
+    df = df.reset_index(drop=True)
+    codes = classify_strat_codes(df["high"].to_numpy(), df["low"].to_numpy())
+    df["strat"] = pd.Categorical.from_codes(codes, dtype=STRAT_DTYPE)
     return df
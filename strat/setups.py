@@ -1,29 +1,56 @@
-def detect_setups(df):
-    """
-    Detect STRAT multi-candle setups.
-    """
-    df = df.copy()
-    df["setup"] = None
+import numpy as np
+
+from strat.classify import STRAT_1, STRAT_2D, STRAT_2U, STRAT_3, code_windows, strat_codes, window_index
 
-    for i in range(2, len(df)):
-        s1 = df.loc[i - 2, "strat"]
-        s2 = df.loc[i - 1, "strat"]
-        s3 = df.loc[i, "strat"]
 
+def _setup_table(s1, s2, s3):
+    # s1, s2, s3 = strat codes of bars i-2, i-1, i
+    s1_two = (s1 == STRAT_2U) | (s1 == STRAT_2D)
+    s2_two = (s2 == STRAT_2U) | (s2 == STRAT_2D)
+    s3_two = (s3 == STRAT_2U) | (s3 == STRAT_2D)
+    bias = np.where(s3 == STRAT_2U, "Bullish", "Bearish").astype(object)
+
+    conds = [
         # 2-1-2 continuation
-        if s1 in ["2U", "2D"] and s2 == "1" and s3 == s1:
-            df.loc[i, "setup"] = f"2-1-2 {'Bullish' if s3 == '2U' else 'Bearish'} Continuation"
+        s1_two & (s2 == STRAT_1) & (s3 == s1),
         # 3-1-2 reversal
-        elif s1 == "3" and s2 == "1" and s3 in ["2U", "2D"]:
-            df.loc[i, "setup"] = f"3-1-2 {'Bullish' if s3 == '2U' else 'Bearish'} Reversal"
+        (s1 == STRAT_3) & (s2 == STRAT_1) & s3_two,
         # Rev Strat 1-2-2
-        elif s1 == "1" and s2 in ["2U", "2D"] and s3 == s2:
-            df.loc[i, "setup"] = f"Rev Strat 1-2-2 {'Bullish' if s3 == '2U' else 'Bearish'}"
+        (s1 == STRAT_1) & s2_two & (s3 == s2),
         # 2-2 continuation
-        elif s2 in ["2U", "2D"] and s3 == s2:
-            df.loc[i, "setup"] = f"2-2 {'Bullish' if s3 == '2U' else 'Bearish'} Continuation"
+        s2_two & (s3 == s2),
         # 2-2 reversal
-        elif s2 in ["2U", "2D"] and s3 in ["2U", "2D"] and s2 != s3:
-            df.loc[i, "setup"] = f"2-2 {'Bullish' if s3 == '2U' else 'Bearish'} Reversal"
+        s2_two & s3_two & (s2 != s3),
+    ]
+    choices = [
+        "2-1-2 " + bias + " Continuation",
+        "3-1-2 " + bias + " Reversal",
+        "Rev Strat 1-2-2 " + bias,
+        "2-2 " + bias + " Continuation",
+        "2-2 " + bias + " Reversal",
+    ]
+    return np.select(conds, choices, default=None)
+
+
+# Label for every possible (i-2, i-1, i) code window, formatted once at import
+_SETUP_LABELS = _setup_table(*code_windows(3))
+
 
+def setup_labels(codes):
+    """
+    Multi-candle setup label (or None) per bar, from the bars' strat codes.
+    """
+    setup = np.full(len(codes), None, dtype=object)
+    if len(codes) > 2:
+        setup[2:] = _SETUP_LABELS[window_index(codes, 3)]
+    return setup
+
+
+def detect_setups(df):
+    """
+    Detect STRAT multi-candle setups.
+    """
+    # shallow: only a new column is attached
+    df = df.copy(deep=False)
+    df["setup"] = setup_labels(strat_codes(df["strat"]))
     return df
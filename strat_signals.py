@@ -3,14 +3,21 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Optional
+from datetime import date
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
 import pandas as pd
 from zoneinfo import ZoneInfo
 
+from strat.classify import STRAT_1, STRAT_2D, STRAT_2U, STRAT_3, strat_codes, strat_label
+
 NY = ZoneInfo("America/New_York")
 
+_1H = pd.Timedelta(hours=1)
 
-@dataclass
+
+@dataclass(slots=True)
 class StratSignal:
     tf: str
     kind: str  # "NEXT" or "TRIGGERED" (main.py filters TRIGGERED out)
@@ -38,6 +45,29 @@ class StratSignal:
     last_close: float
 
 
+@dataclass
+class OHLC:
+    """
+    Struct-of-arrays view over one timeframe frame, for cheap positional reads
+    (no per-row Series / label lookups).
+    """
+    ts: pd.api.extensions.ExtensionArray
+    o: np.ndarray
+    h: np.ndarray
+    l: np.ndarray
+    c: np.ndarray
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "OHLC":
+        return cls(
+            ts=df["timestamp"].array,
+            o=df["open"].to_numpy(dtype="float64"),
+            h=df["high"].to_numpy(dtype="float64"),
+            l=df["low"].to_numpy(dtype="float64"),
+            c=df["close"].to_numpy(dtype="float64"),
+        )
+
+
 def _to_ny(ts) -> pd.Timestamp:
     t = pd.to_datetime(ts, errors="coerce")
     if pd.isna(t):
@@ -47,13 +77,20 @@ def _to_ny(ts) -> pd.Timestamp:
     return t.tz_convert(NY)
 
 
-def _market_close_dt(date_ts: pd.Timestamp) -> pd.Timestamp:
-    d = _to_ny(date_ts).date()
+@lru_cache(maxsize=4096)
+def _market_close_on(d: date) -> pd.Timestamp:
     return pd.Timestamp(year=d.year, month=d.month, day=d.day, hour=16, minute=30, tz=NY)
 
 
-def last_closed_index(tf: str, df_tf: pd.DataFrame) -> int:
+def _market_close_dt(date_ts: pd.Timestamp) -> pd.Timestamp:
+    # Every ticker's D/W/M/Q/Y frame in a scan ends on the same few dates
+    return _market_close_on(_to_ny(date_ts).date())
+
+
+def last_closed_index(tf: str, df_tf: pd.DataFrame, now: Optional[pd.Timestamp] = None) -> int:
     """
+    now: NY-time "now" shared by every timeframe of one scan (defaults to the clock).
+
     Closed-bar logic:
     - 1H: Yahoo 60m timestamps behave like bar START -> closed if now >= ts + 1 hour
     - 2H/3H/4H: resampled with label='right' -> timestamp is bar END -> closed if now >= ts
@@ -63,8 +100,9 @@ def last_closed_index(tf: str, df_tf: pd.DataFrame) -> int:
         return -1
 
     tf = tf.strip().upper()
-    now = pd.Timestamp.now(tz=NY)
-    ts_last = _to_ny(df_tf.iloc[-1]["timestamp"])
+    if now is None:
+        now = pd.Timestamp.now(tz=NY)
+    ts_last = _to_ny(df_tf["timestamp"].iloc[-1])
 
     if tf in ("W", "M", "Q", "Y"):
         if ts_last > now:
@@ -79,7 +117,7 @@ def last_closed_index(tf: str, df_tf: pd.DataFrame) -> int:
         return -1
 
     if tf == "1H":
-        bar_end = ts_last + pd.Timedelta(hours=1)
+        bar_end = ts_last + _1H
         if now < bar_end:
             return -2
         return -1
@@ -92,6 +130,48 @@ def last_closed_index(tf: str, df_tf: pd.DataFrame) -> int:
     return -1
 
 
+class _Setup(NamedTuple):
+    setup: str      # "{prev}" is filled with the previous bar's strat label
+    direction: str  # "bull": entry above the last bar, stop below; "bear": the reverse
+    trigger: str
+    note: str
+
+
+def _build_rules() -> Dict[Tuple[int, int], Tuple[_Setup, ...]]:
+    """
+    Next-bar setups per (prev, last) closed strat code pair.
+    """
+    inside = (
+        _Setup("1-2 BREAK_UP", "bull", "inside break UP", "Inside bar break UP (1-2)"),
+        _Setup("1-2 BREAK_DOWN", "bear", "inside break DOWN", "Inside bar break DOWN (1-2)"),
+    )
+    outside = (
+        _Setup("3-2 BREAK_UP", "bull", "outside break UP", "Outside bar break UP (3-2)"),
+        _Setup("3-2 BREAK_DOWN", "bear", "outside break DOWN", "Outside bar break DOWN (3-2)"),
+    )
+    # RevStrat watch: after (1 or 3) then (2U/2D) => watch for 2 reversal next (1-2-2 / 3-2-2)
+    rev_after_up = (
+        _Setup("REVSTRAT {prev}-2-2 (watch 2D)", "bear", "RevStrat bear",
+               "RevStrat after {prev}-2U: watch for 2D reversal ({prev}-2U-2D)"),
+    )
+    rev_after_down = (
+        _Setup("REVSTRAT {prev}-2-2 (watch 2U)", "bull", "RevStrat bull",
+               "RevStrat after {prev}-2D: watch for 2U reversal ({prev}-2D-2U)"),
+    )
+
+    rules: Dict[Tuple[int, int], Tuple[_Setup, ...]] = {}
+    for prev in (-1, STRAT_1, STRAT_2U, STRAT_2D, STRAT_3):
+        rules[(prev, STRAT_1)] = inside
+        rules[(prev, STRAT_3)] = outside
+    for prev in (STRAT_1, STRAT_3):
+        rules[(prev, STRAT_2U)] = rev_after_up
+        rules[(prev, STRAT_2D)] = rev_after_down
+    return rules
+
+
+_RULES = _build_rules()
+
+
 def _fmt2(x: float) -> float:
     try:
         return float(round(float(x), 2))
@@ -99,153 +179,72 @@ def _fmt2(x: float) -> float:
         return x
 
 
-def analyze_last_closed_setups(df_tf: pd.DataFrame, tf: str) -> List[StratSignal]:
+def analyze_last_closed_setups(
+    df_tf: pd.DataFrame,
+    tf: str,
+    last_idx: Optional[int] = None,
+    codes: Optional[np.ndarray] = None,
+) -> List[StratSignal]:
+    """
+    last_idx: last_closed_index(tf, df_tf) when the caller already resolved it
+    (df_tf must then already be sorted by timestamp).
+    codes: strat codes of df_tf's bars (classify_strat_codes) when the caller has them;
+    otherwise they are read from df_tf["strat"].
+    """
     if df_tf is None or df_tf.empty or len(df_tf) < 3:
         return []
 
-    df_tf = df_tf.sort_values("timestamp").reset_index(drop=True)
-
-    last_idx = last_closed_index(tf, df_tf)
+    if last_idx is None:
+        # classify_strat_candles keeps row order, so scan frames arrive sorted already
+        if not df_tf["timestamp"].is_monotonic_increasing:
+            df_tf = df_tf.sort_values("timestamp").reset_index(drop=True)
+        last_idx = last_closed_index(tf, df_tf)
     prev_idx = last_idx - 1
     if len(df_tf) < abs(prev_idx):
         return []
 
-    prev = df_tf.iloc[prev_idx]
-    last = df_tf.iloc[last_idx]
+    bars = OHLC.from_frame(df_tf)
+    if codes is None:
+        if "strat" in df_tf.columns:
+            codes = strat_codes(df_tf["strat"])
+        else:
+            codes = np.full(len(df_tf), -1, dtype=np.int8)
 
-    prev_s = str(prev.get("strat"))
-    last_s = str(last.get("strat"))
+    prev_code = codes[prev_idx]
+    last_code = codes[last_idx]
+    prev_s = strat_label(prev_code)
+    last_s = strat_label(last_code)
 
-    prev_ts = pd.to_datetime(prev["timestamp"])
-    last_ts = pd.to_datetime(last["timestamp"])
+    prev_ts = pd.to_datetime(bars.ts[prev_idx])
+    last_ts = pd.to_datetime(bars.ts[last_idx])
 
-    prev_o = float(prev["open"]);  prev_h = float(prev["high"]);  prev_l = float(prev["low"]);  prev_c = float(prev["close"])
-    last_o = float(last["open"]);  last_h = float(last["high"]);  last_l = float(last["low"]);  last_c = float(last["close"])
+    # Every signal reports the same two bars, rounded once
+    prev_o = _fmt2(bars.o[prev_idx]);  prev_h = _fmt2(bars.h[prev_idx]);  prev_l = _fmt2(bars.l[prev_idx]);  prev_c = _fmt2(bars.c[prev_idx])
+    last_o = _fmt2(bars.o[last_idx]);  last_h = _fmt2(bars.h[last_idx]);  last_l = _fmt2(bars.l[last_idx]);  last_c = _fmt2(bars.c[last_idx])
 
+    pattern = f"{prev_s}-{last_s}"
     signals: List[StratSignal] = []
-
-    # -----------------------------
-    # INSIDE BAR (last = 1) => play 1-2 (break either way)
-    # -----------------------------
-    if last_s == "1":
-        # Break UP
+    for spec in _RULES.get((int(prev_code), int(last_code)), ()):
+        if spec.direction == "bull":
+            entry, stop, trigger = last_h, last_l, f"price > {last_h} ({spec.trigger}); stop < {last_l}"
+        else:
+            entry, stop, trigger = last_l, last_h, f"price < {last_l} ({spec.trigger}); stop > {last_h}"
         signals.append(
             StratSignal(
                 tf=tf,
                 kind="NEXT",
-                pattern=f"{prev_s}-1",
-                setup="1-2 BREAK_UP",
-                direction="bull",
-                actionable=f"ALERT if price > {_fmt2(last_h)} (inside break UP); stop < {_fmt2(last_l)}",
-                entry=_fmt2(last_h),
-                stop=_fmt2(last_l),
-                note="Inside bar break UP (1-2)",
+                pattern=pattern,
+                setup=spec.setup.format(prev=prev_s),
+                direction=spec.direction,
+                actionable=f"ALERT if {trigger}",
+                entry=entry,
+                stop=stop,
+                note=spec.note.format(prev=prev_s),
                 prev_closed_ts=prev_ts, prev_strat=prev_s,
-                prev_open=_fmt2(prev_o), prev_high=_fmt2(prev_h), prev_low=_fmt2(prev_l), prev_close=_fmt2(prev_c),
+                prev_open=prev_o, prev_high=prev_h, prev_low=prev_l, prev_close=prev_c,
                 last_closed_ts=last_ts, last_strat=last_s,
-                last_open=_fmt2(last_o), last_high=_fmt2(last_h), last_low=_fmt2(last_l), last_close=_fmt2(last_c),
+                last_open=last_o, last_high=last_h, last_low=last_l, last_close=last_c,
             )
         )
-        # Break DOWN
-        signals.append(
-            StratSignal(
-                tf=tf,
-                kind="NEXT",
-                pattern=f"{prev_s}-1",
-                setup="1-2 BREAK_DOWN",
-                direction="bear",
-                actionable=f"ALERT if price < {_fmt2(last_l)} (inside break DOWN); stop > {_fmt2(last_h)}",
-                entry=_fmt2(last_l),
-                stop=_fmt2(last_h),
-                note="Inside bar break DOWN (1-2)",
-                prev_closed_ts=prev_ts, prev_strat=prev_s,
-                prev_open=_fmt2(prev_o), prev_high=_fmt2(prev_h), prev_low=_fmt2(prev_l), prev_close=_fmt2(prev_c),
-                last_closed_ts=last_ts, last_strat=last_s,
-                last_open=_fmt2(last_o), last_high=_fmt2(last_h), last_low=_fmt2(last_l), last_close=_fmt2(last_c),
-            )
-        )
-
-    # -----------------------------
-    # OUTSIDE BAR (last = 3) => play 3-2 (break either way)
-    # -----------------------------
-    if last_s == "3":
-        signals.append(
-            StratSignal(
-                tf=tf,
-                kind="NEXT",
-                pattern=f"{prev_s}-3",
-                setup="3-2 BREAK_UP",
-                direction="bull",
-                actionable=f"ALERT if price > {_fmt2(last_h)} (outside break UP); stop < {_fmt2(last_l)}",
-                entry=_fmt2(last_h),
-                stop=_fmt2(last_l),
-                note="Outside bar break UP (3-2)",
-                prev_closed_ts=prev_ts, prev_strat=prev_s,
-                prev_open=_fmt2(prev_o), prev_high=_fmt2(prev_h), prev_low=_fmt2(prev_l), prev_close=_fmt2(prev_c),
-                last_closed_ts=last_ts, last_strat=last_s,
-                last_open=_fmt2(last_o), last_high=_fmt2(last_h), last_low=_fmt2(last_l), last_close=_fmt2(last_c),
-            )
-        )
-        signals.append(
-            StratSignal(
-                tf=tf,
-                kind="NEXT",
-                pattern=f"{prev_s}-3",
-                setup="3-2 BREAK_DOWN",
-                direction="bear",
-                actionable=f"ALERT if price < {_fmt2(last_l)} (outside break DOWN); stop > {_fmt2(last_h)}",
-                entry=_fmt2(last_l),
-                stop=_fmt2(last_h),
-                note="Outside bar break DOWN (3-2)",
-                prev_closed_ts=prev_ts, prev_strat=prev_s,
-                prev_open=_fmt2(prev_o), prev_high=_fmt2(prev_h), prev_low=_fmt2(prev_l), prev_close=_fmt2(prev_c),
-                last_closed_ts=last_ts, last_strat=last_s,
-                last_open=_fmt2(last_o), last_high=_fmt2(last_h), last_low=_fmt2(last_l), last_close=_fmt2(last_c),
-            )
-        )
-
-    # -----------------------------
-    # REVSTRAT WATCH: after (1 or 3) then (2U/2D) => watch for 2 reversal next
-    # (1-2-2 or 3-2-2 concept)
-    # -----------------------------
-    if prev_s in ("1", "3") and last_s in ("2U", "2D"):
-        if last_s == "2U":
-            # after 1-2U or 3-2U: watch for 2D reversal (bear)
-            signals.append(
-                StratSignal(
-                    tf=tf,
-                    kind="NEXT",
-                    pattern=f"{prev_s}-2U",
-                    setup=f"REVSTRAT {prev_s}-2-2 (watch 2D)",
-                    direction="bear",
-                    actionable=f"ALERT if price < {_fmt2(last_l)} (RevStrat bear); stop > {_fmt2(last_h)}",
-                    entry=_fmt2(last_l),
-                    stop=_fmt2(last_h),
-                    note=f"RevStrat after {prev_s}-2U: watch for 2D reversal ({prev_s}-2U-2D)",
-                    prev_closed_ts=prev_ts, prev_strat=prev_s,
-                    prev_open=_fmt2(prev_o), prev_high=_fmt2(prev_h), prev_low=_fmt2(prev_l), prev_close=_fmt2(prev_c),
-                    last_closed_ts=last_ts, last_strat=last_s,
-                    last_open=_fmt2(last_o), last_high=_fmt2(last_h), last_low=_fmt2(last_l), last_close=_fmt2(last_c),
-                )
-            )
-        if last_s == "2D":
-            # after 1-2D or 3-2D: watch for 2U reversal (bull)
-            signals.append(
-                StratSignal(
-                    tf=tf,
-                    kind="NEXT",
-                    pattern=f"{prev_s}-2D",
-                    setup=f"REVSTRAT {prev_s}-2-2 (watch 2U)",
-                    direction="bull",
-                    actionable=f"ALERT if price > {_fmt2(last_h)} (RevStrat bull); stop < {_fmt2(last_l)}",
-                    entry=_fmt2(last_h),
-                    stop=_fmt2(last_l),
-                    note=f"RevStrat after {prev_s}-2D: watch for 2U reversal ({prev_s}-2D-2U)",
-                    prev_closed_ts=prev_ts, prev_strat=prev_s,
-                    prev_open=_fmt2(prev_o), prev_high=_fmt2(prev_h), prev_low=_fmt2(prev_l), prev_close=_fmt2(prev_c),
-                    last_closed_ts=last_ts, last_strat=last_s,
-                    last_open=_fmt2(last_o), last_high=_fmt2(last_h), last_low=_fmt2(last_l), last_close=_fmt2(last_c),
-                )
-            )
 
     return signals
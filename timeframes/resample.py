@@ -1,64 +1,159 @@
 # timeframes/resample.py
 
+import numpy as np
 import pandas as pd
+from pandas.tseries.frequencies import to_offset
 
 
-def resample_timeframe(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
-    """
-    Resample OHLCV into STRAT-compatible timeframes.
+RULES = {
+    # Intraday
+    "5M": "5min",
+    "10M": "10min",
+    "15M": "15min",
+    "30M": "30min",
+    "1H": "1h",
+    "2H": "2h",
+    "3H": "3h",
+    "4H": "4h",
 
-    Required columns:
-      timestamp, open, high, low, close, volume
+    # Daily + Weekly (market week ends Friday)
+    "D": "1D",
+    "W": "W-FRI",
 
-    Key choices:
-      - Weekly uses market weeks ending Friday: W-FRI
-      - Month/Quarter/Year use end-based offsets: ME/QE/YE
-      - label='right', closed='right' so timestamps represent bar end
-    """
-    if df is None or df.empty:
-        return pd.DataFrame()
-
-    df = df.copy()
-    df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
-    df = df.dropna(subset=["timestamp"]).sort_values("timestamp")
-    df = df.set_index("timestamp")
+    # Higher TFs
+    "M": "ME",
+    "Q": "QE",
+    "Y": "YE",
+}
 
-    timeframe = timeframe.strip().upper()
+OHLC_AGG = {
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    "volume": "sum",
+}
 
-    RULES = {
-        # Intraday
-        "1H": "1h",
-        "2H": "2h",
-        "3H": "3h",
-        "4H": "4h",
 
-        # Daily + Weekly (market week ends Friday)
-        "D": "1D",
-        "W": "W-FRI",
+def _is_parsed_sorted(ts: pd.Series) -> bool:
+    return pd.api.types.is_datetime64_any_dtype(ts) and ts.is_monotonic_increasing and not ts.hasnans
 
-        # Higher TFs
-        "M": "ME",
-        "Q": "QE",
-        "Y": "YE",
-    }
 
+def _rule(timeframe: str) -> str:
+    timeframe = timeframe.strip().upper()
     if timeframe not in RULES:
         raise ValueError(f"Unsupported timeframe: {timeframe}")
+    return RULES[timeframe]
+
+
+def _bin_labels(ts: pd.DatetimeIndex, rule: str) -> pd.DatetimeIndex:
+    """
+    Right-edge label of the resample bin each timestamp falls in, matching
+    df.resample(rule, label="right", closed="right") for the rules used here.
+    """
+    offset = to_offset(rule)
+    if isinstance(offset, pd.offsets.Tick):
+        # Fixed-length bins counted from midnight of the first day (resample's origin="start_day")
+        ts = ts.as_unit("ns")
+        v = ts.asi8
+        origin = ts[0].normalize().value
+        step = offset.nanos
+        labels = origin - ((origin - v) // step) * step
+        out = pd.DatetimeIndex(labels.view("datetime64[ns]"))
+        return out if ts.tz is None else out.tz_localize("UTC").tz_convert(ts.tz)
+    # W-FRI/ME/QE/YE: a bar belongs to the first anchor on or after its day
+    return ts.normalize() + offset * 0
+
 
-    rule = RULES[timeframe]
-
-    ohlc = {
-        "open": "first",
-        "high": "max",
-        "low": "min",
-        "close": "last",
-        "volume": "sum",
-    }
-
-    out = (
-        df.resample(rule, label="right", closed="right")
-        .agg(ohlc)
-        .dropna()
-        .reset_index()
+def _first_valid(x: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    if x.dtype.kind != "f":
+        return x[starts]
+    pos = np.minimum.reduceat(np.where(np.isnan(x), len(x), np.arange(len(x))), starts)
+    return np.where(pos < ends, x[np.minimum(pos, len(x) - 1)], np.nan)
+
+
+def _last_valid(x: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    if x.dtype.kind != "f":
+        return x[ends - 1]
+    pos = np.maximum.reduceat(np.where(np.isnan(x), -1, np.arange(len(x))), starts)
+    return np.where(pos >= starts, x[np.maximum(pos, 0)], np.nan)
+
+
+def _aggregate_ohlc(df: pd.DataFrame, rule: str) -> pd.DataFrame:
+    """
+    One rule's OHLC_AGG over sorted, parsed bars: consecutive bars sharing a bin label
+    are reduced with numpy ufunc.reduceat (only non-empty bins exist, so the
+    resample + dropna of empty bins comes for free).
+    """
+    ts = pd.DatetimeIndex(df["timestamp"])
+    labels = _bin_labels(ts, rule)
+    lab = labels.asi8
+    starts = np.flatnonzero(np.r_[True, lab[1:] != lab[:-1]])
+    ends = np.r_[starts[1:], len(lab)]
+
+    o = df["open"].to_numpy()
+    h = df["high"].to_numpy()
+    l = df["low"].to_numpy()
+    c = df["close"].to_numpy()
+    v = df["volume"].to_numpy()
+
+    out = pd.DataFrame(
+        {
+            "timestamp": labels[starts].as_unit(ts.unit),
+            "open": _first_valid(o, starts, ends),
+            # fmax/fmin skip NaN like groupby max/min
+            "high": np.fmax.reduceat(h, starts) if h.dtype.kind == "f" else np.maximum.reduceat(h, starts),
+            "low": np.fmin.reduceat(l, starts) if l.dtype.kind == "f" else np.minimum.reduceat(l, starts),
+            "close": _last_valid(c, starts, ends),
+            "volume": np.add.reduceat(np.nan_to_num(v) if v.dtype.kind == "f" else v, starts),
+        }
     )
+    return out.dropna().reset_index(drop=True)
+
+
+def resample_timeframes(df: pd.DataFrame, timeframes: list[str]) -> dict[str, pd.DataFrame]:
+    """
+    resample_timeframe for several timeframes off the same base: the timestamp
+    column is checked/parsed once, not once per timeframe.
+    Returns {timeframe (as passed): frame}.
+    """
+    if df is None or df.empty:
+        return {tf: pd.DataFrame() for tf in timeframes}
+
+    rules = {tf: _rule(tf) for tf in timeframes}
+
+    # Feeds from loaders.yahoo are already parsed + sorted; only re-parse anything else
+    if not _is_parsed_sorted(df["timestamp"]):
+        df = df.copy()
+        df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
+        df = df.dropna(subset=["timestamp"]).sort_values("timestamp")
+
+    out = {}
+    for tf, rule in rules.items():
+        if isinstance(to_offset(rule), pd.offsets.Day):
+            # calendar-day bins (tz-naive origin) are left to pandas
+            out[tf] = (
+                df.set_index("timestamp")
+                .resample(rule, label="right", closed="right")
+                .agg(OHLC_AGG)
+                .dropna()
+                .reset_index()
+            )
+        else:
+            out[tf] = _aggregate_ohlc(df, rule)
     return out
+
+
+def resample_timeframe(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """
+    Resample OHLCV into STRAT-compatible timeframes.
+
+    Required columns:
+      timestamp, open, high, low, close, volume
+
+    Key choices:
+      - Weekly uses market weeks ending Friday: W-FRI
+      - Month/Quarter/Year use end-based offsets: ME/QE/YE
+      - label='right', closed='right' so timestamps represent bar end
+    """
+    return resample_timeframes(df, [timeframe])[timeframe]
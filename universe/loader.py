@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import json
 import os
-import re
+import string
 import time
 from typing import List, Dict
 
@@ -19,6 +19,7 @@ from config import (
     PRIORITY_PER_RUN,
     ROTATION_PER_RUN,
     UNIVERSE_CACHE_TTL_SEC,
+    UNSCANNABLE_TTL_SEC,
     CORE_ETFS,
 )
 
@@ -29,6 +30,8 @@ CACHE_DIR = "cache/universe"
 CACHE_STOCKS = os.path.join(CACHE_DIR, "stocks_biggest.csv")
 CACHE_ETFS = os.path.join(CACHE_DIR, "etfs_all.csv")
 CACHE_STATE = os.path.join(CACHE_DIR, "state.json")
+# ticker -> epoch seconds it last came back without enough daily data
+CACHE_UNSCANNABLE = os.path.join(CACHE_DIR, "unscannable.json")
 
 # ETF membership cache
 CACHE_CORE_HOLDINGS = os.path.join(CACHE_DIR, "core_etf_holdings.csv")
@@ -62,13 +65,18 @@ def _is_fresh(path: str, ttl_sec: int) -> bool:
     return (time.time() - os.path.getmtime(path)) <= ttl_sec
 
 
+class _SymbolTable(dict):
+    # str.translate table: "." -> "-", A-Z0-9- kept, every other char (incl. "$") dropped
+    def __missing__(self, key: int) -> None:
+        return None
+
+
+SYMBOL_TRANSLATION = _SymbolTable({ord(ch): ord(ch) for ch in string.ascii_uppercase + string.digits + "-"})
+SYMBOL_TRANSLATION[ord(".")] = ord("-")
+
+
 def _normalize_symbol(sym: str) -> str:
-    s = str(sym).strip().upper()
-    if s.startswith("$"):
-        s = s[1:]
-    s = s.replace(".", "-")
-    s = re.sub(r"[^A-Z0-9\-]", "", s)
-    return s
+    return str(sym).upper().translate(SYMBOL_TRANSLATION)
 
 
 def _parse_market_cap_to_int(value) -> int | None:
@@ -165,6 +173,35 @@ def _write_state(state: dict) -> None:
         json.dump(state, f, indent=2)
 
 
+def _read_unscannable() -> Dict[str, float]:
+    try:
+        with open(CACHE_UNSCANNABLE, "r", encoding="utf-8") as f:
+            return {str(k): float(v) for k, v in json.load(f).items()}
+    except Exception:
+        return {}
+
+
+def load_unscannable(ttl_sec: int = UNSCANNABLE_TTL_SEC) -> set:
+    """
+    Tickers recorded as unscannable within the last ttl_sec.
+    """
+    now = time.time()
+    return {t for t, ts in _read_unscannable().items() if now - ts < ttl_sec}
+
+
+def record_unscannable(tickers: List[str], ttl_sec: int = UNSCANNABLE_TTL_SEC) -> None:
+    """
+    Mark tickers as unscannable now (expired entries are dropped on the way).
+    """
+    _ensure_dirs()
+    now = time.time()
+    seen = {t: ts for t, ts in _read_unscannable().items() if now - ts < ttl_sec}
+    for t in tickers:
+        seen[t] = now
+    with open(CACHE_UNSCANNABLE, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(seen.items())), f, indent=2)
+
+
 def _dedupe_keep_order(items: List[str]) -> List[str]:
     seen = set()
     out: List[str] = []